@@ -162,6 +162,9 @@ def integrate_steps(
         # Update initial conditions for the next time step
         state0 = state1
 
+    if write:
+        f.flush()
+
     return state0, step_info
 
 def integrate_linear(
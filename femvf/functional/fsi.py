@@ -84,6 +84,8 @@ class TransferWorkbyVelocity(FSIFunctional):
         # Calculate the power at `ii` and `ii+1` then use trapezoidal rule to integrate
         # the power over that time increment to get the work done
         work = 0
+        # Times are read once rather than once per step
+        ts = f.get_times()
         # Both states are set here due to differences in explicit/implicit FSI coupling strategies
         self.model.set_ini_state(f.get_state(N_START))
         self.model.set_fin_state(f.get_state(N_START))
@@ -93,8 +95,7 @@ class TransferWorkbyVelocity(FSIFunctional):
             self.model.set_fin_state(f.get_state(ii+1))
             fluid_power1 = dfn.assemble(self.forms['fluid_power'])
 
-            ts = f['time'][ii:ii+2]
-            dt = ts[1] - ts[0]
+            dt = ts[ii+1] - ts[ii]
             work += 1/2*(fluid_power0 + fluid_power1)*dt
 
             fluid_power0 = fluid_power1
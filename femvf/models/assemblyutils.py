@@ -1,3 +1,5 @@
+import functools
+
 import ufl
 import dolfin as dfn
 
@@ -27,6 +29,7 @@ class CachedFormAssembler:
                 raise ValueError("Form arity must be between 0 and 2")
 
         self._tensor = tensor
+        self._form_compiler_parameters = kwargs.pop('form_compiler_parameters', None)
         self._kwargs = kwargs
 
     @property
@@ -37,5 +40,15 @@ class CachedFormAssembler:
     def form(self):
         return self._form
 
+    @functools.cached_property
+    def _dolfin_form(self) -> dfn.Form:
+        # Assembling a `ufl.Form` creates a new `dfn.Form` for each call, which
+        # goes through the form compiler's cache; creating it once here skips
+        # that. Coefficient values are still updated since the `dfn.Form`
+        # refers to the same coefficient objects.
+        return dfn.Form(
+            self.form, form_compiler_parameters=self._form_compiler_parameters
+        )
+
     def assemble(self):
-        return dfn.assemble(self.form, tensor=self.tensor, **self._kwargs)
\ No newline at end of file
+        return dfn.assemble(self._dolfin_form, tensor=self.tensor, **self._kwargs)
\ No newline at end of file
@@ -41,6 +41,10 @@ class Model(base.BaseTransientModel):
             list(prop.values()), labels=[list(prop.keys())]
         )
 
+        # NOTE: The `primals` dicts reference the sub-arrays of `state1`,
+        # `control` and `prop` so they track changes to those vectors without
+        # being rebuilt. This relies on the setters assigning in-place
+        # (`[:] = ...`) and never rebinding the block vectors.
         self.primals = (
             blockvec_to_dict(self.state1),
             blockvec_to_dict(self.control),
@@ -69,18 +73,24 @@ class Model(base.BaseTransientModel):
     def set_fin_state(self, state):
         """
         Set the final fluid state
+
+        Values are assigned in-place so `self.primals` stays valid
         """
         self.state1[:] = state
 
     def set_control(self, control):
         """
         Set the final surface displacement and velocity
+
+        Values are assigned in-place so `self.primals` stays valid
         """
         self.control[:] = control
 
     def set_prop(self, prop):
         """
         Set the fluid properties
+
+        Values are assigned in-place so `self.primals` stays valid
         """
         self.prop[:] = prop
 
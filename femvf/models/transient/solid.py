@@ -190,15 +190,27 @@ class Model(base.BaseTransientModel):
     ## Residual and sensitivity functions
     def assem_res(self):
         dt = self.dt
-        u1, v1, a1 = self.state1.sub_blocks.flat
+        u1 = self.state1.sub['u']
+        u0, v0, a0 = self.state0.sub_blocks.flat
 
         res = self.state1.copy()
-        values = [
-            self.cached_form_assemblers['form.un.f1'].assemble(),
-            v1 - newmark.newmark_v(u1, *self.state0.sub_blocks, dt),
-            a1 - newmark.newmark_a(u1, *self.state0.sub_blocks, dt)
-        ]
-        res[:] = values
+        res.sub['u'][:] = self.cached_form_assemblers['form.un.f1'].assemble()
+
+        # The Newmark updates are linear so the 'v' and 'a' residuals are
+        # computed in place from the copies of `v1` and `a1` in `res`, which
+        # avoids creating a temporary vector for each term
+        res_v = res.sub['v']
+        res_v.axpy(-newmark.newmark_v_du1(dt), u1)
+        res_v.axpy(-newmark.newmark_v_du0(dt), u0)
+        res_v.axpy(-newmark.newmark_v_dv0(dt), v0)
+        res_v.axpy(-newmark.newmark_v_da0(dt), a0)
+
+        res_a = res.sub['a']
+        res_a.axpy(-newmark.newmark_a_du1(dt), u1)
+        res_a.axpy(-newmark.newmark_a_du0(dt), u0)
+        res_a.axpy(-newmark.newmark_a_dv0(dt), v0)
+        res_a.axpy(-newmark.newmark_a_da0(dt), a0)
+
         for bc in self.residual.dirichlet_bcs:
             bc.apply(res.sub['u'])
         return res
@@ -296,11 +308,37 @@ class Model(base.BaseTransientModel):
         raise NotImplementedError("Not implemented yet!")
 
     ## Solver functions
+    @functools.cached_property
+    def _lu_solver(self) -> dfn.PETScLUSolver:
+        # A single LU solver is reused for every linear solve (each Newton
+        # iteration of each time step) instead of setting up a new one per
+        # solve
+        return dfn.PETScLUSolver('petsc')
+
     def solve_state1(self, state1, options=None):
+        """
+        Solve for the final state given an initial guess
+
+        Parameters
+        ----------
+        state1 :
+            The initial guess for the final state
+        options :
+            Newton solver parameters
+
+            If `options['reuse_jacobian']` is true, the Jacobian from the first
+            Newton iteration is reused for the remaining iterations (a
+            modified Newton method). This avoids re-assembling and
+            re-factoring the Jacobian at each iteration but usually needs
+            more iterations to converge.
+        """
         if options is None:
             options = DEFAULT_NEWTON_SOLVER_PRM
+        options = options.copy()
+        reuse_jacobian = options.pop('reuse_jacobian', False)
 
         x = state1.copy()
+        jacobian = []
         def linearized_subproblem(state):
             """
             Return a solver and residual corresponding to the linearized subproblem
@@ -314,8 +352,11 @@ class Model(base.BaseTransientModel):
             assem_res = self.assem_res
 
             def solve(res):
-                dres_dstate1 = self.assem_dres_dstate1()
-                return self.solve_dres_dstate1(dres_dstate1, x, res)
+                # Passing the same matrix to the LU solver again reuses its
+                # factorization
+                if not (reuse_jacobian and jacobian):
+                    jacobian[:] = [self.assem_dres_dstate1()]
+                return self.solve_dres_dstate1(jacobian[0], x, res)
             return assem_res, solve
 
         state_n, solve_info = newton_solve(state1, linearized_subproblem, params=options)
@@ -338,7 +379,8 @@ class Model(base.BaseTransientModel):
         bu, bv, ba = b.sub_blocks
 
         xu = x.sub['u']
-        dfn.solve(dfu1_du1, xu, bu, 'petsc')
+        self._lu_solver.set_operator(dfu1_du1)
+        self._lu_solver.solve(xu, bu)
         x['v'][:] = bv - dfv1_du1*xu
         x['a'][:] = ba - dfa1_du1*xu
 
@@ -363,7 +405,8 @@ class Model(base.BaseTransientModel):
         x.sub['v'][:] = bv
 
         rhs_u = bu - (dfv_du*b['v'] + dfa_du*b['a'])
-        dfn.solve(dfu_du, x['u'], rhs_u, 'petsc')
+        self._lu_solver.set_operator(dfu_du)
+        self._lu_solver.solve(x['u'], rhs_u)
         return x
 
 class PredefinedModel(Model):
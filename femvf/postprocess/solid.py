@@ -14,6 +14,7 @@ import ufl
 from blockarray.subops import solve_petsc_lu
 
 from femvf.models.transient.base import BaseTransientModel
+from femvf.models.assemblyutils import CachedFormAssembler
 from .base import BaseStateMeasure, BaseDerivedStateMeasure
 
 
@@ -362,6 +363,9 @@ class BaseFieldIntegralMeasure(BaseStateMeasure):
             self.dx = dx
 
         self.expression = self._init_expression()
+        # Integral measures are assembled for every state in a time series so
+        # the assembler (and its tensor) is only created once
+        self.expression_assembler = CachedFormAssembler(self.expression)
 
     def _init_expression(self):
         """
@@ -388,7 +392,7 @@ class ViscousDissipationRate(BaseFieldIntegralMeasure):
         return ufl.inner(kv_stress, kv_strain_rate)*self.dx
 
     def assem(self, state, control, prop):
-        return dfn.assemble(self.expression)
+        return self.expression_assembler.assemble()
 
 ### Field statistics post-processing functions
 
@@ -405,6 +409,8 @@ class FieldStats(BaseDerivedStateMeasure):
         super().__init__(field)
 
         self.expr_total, self.expr_vol, self.dtype = self._init_expression()
+        self.assembler_total = CachedFormAssembler(self.expr_total)
+        self.assembler_vol = CachedFormAssembler(self.expr_vol)
 
     def _init_expression(self):
         dx = self.func.dx
@@ -422,8 +428,8 @@ class FieldStats(BaseDerivedStateMeasure):
 
     def assem(self, state, control, prop):
         field_vec = self.func(state, control, prop)
-        total = dfn.assemble(self.expr_total)
-        vol = dfn.assemble(self.expr_vol)
+        total = self.assembler_total.assemble()
+        vol = self.assembler_vol.assemble()
         return np.array(
             (field_vec.max(), field_vec.min(), total/vol, total),
             dtype=self.dtype
@@ -17,6 +17,13 @@ from blockarray import blockvec as bv
 
 from .models.transient.base import BaseTransientModel
 
+# Default raw data chunk cache settings for opened files (see `h5py.File`)
+DEFAULT_CHUNK_CACHE = {
+    'rdcc_nbytes': 64*1024**2,
+    'rdcc_nslots': 10007,
+    'rdcc_w0': 0.75
+}
+
 class StateFile:
     r"""
     An HDF5 file containing the history of states in a transient model simulation
@@ -52,8 +59,25 @@ class StateFile:
         Mode to open the HDF5 file in (applicable if `fname` is a path)
     NCHUNK : int
         Number of chunks along the time dimension used to store data
+    compression : Optional[str]
+        A compression filter for new state and control datasets (for example,
+        'lzf' or 'gzip')
+
+        Compression gives smaller files at the cost of compressing/decompressing
+        each chunk when it's written/read. Since whole chunks are compressed,
+        larger `NCHUNK` values usually compress better but each read of a
+        single time index decompresses more values.
     kwargs :
         Keyword arguments for `h5py.File` (applicable if `fname` is a path)
+
+        Chunk cache settings default to `DEFAULT_CHUNK_CACHE`.
+
+    Notes
+    -----
+    Appended values are buffered and only written to the file when a whole
+    chunk fills (see `flush`). The reading methods, `__getitem__`,
+    `__setitem__` and `close` flush the buffers first, but code that uses the
+    `file` attribute directly must call `flush` before reading it.
     """
 
     file: h5py.Group
@@ -70,10 +94,14 @@ class StateFile:
             fname: Union[str, h5py.Group],
             mode: str='r',
             NCHUNK: int=100,
+            compression: Optional[str]=None,
             **kwargs
         ):
         self.model: BaseTransientModel = model
         if isinstance(fname, str):
+            # Use a larger chunk cache than the 1 MB `h5py` default so that
+            # chunks of all the state/control datasets can stay cached
+            kwargs = {**DEFAULT_CHUNK_CACHE, **kwargs}
             self.file = h5py.File(fname, mode=mode, **kwargs)
         elif isinstance(fname, h5py.Group):
             self.file = fname
@@ -82,6 +110,19 @@ class StateFile:
                 f"`fname` must be `str` or `h5py.Group` not {type(fname)}"
             )
         self.NCHUNK = NCHUNK
+        self.compression = compression
+
+        # Properties are constant in time so they're only read from the file
+        # once (see `get_prop`)
+        self._prop_values = None
+
+        # Datasets written every time step are cached by path (see `_dataset`)
+        self._datasets = {}
+        self._solver_info_keys = None
+
+        # Appended rows are buffered and written a chunk at a time (see
+        # `_append`)
+        self._append_buffers = {}
 
         # Create the root group and initilizae the data layout
         # group = self.file.name
@@ -106,15 +147,17 @@ class StateFile:
         return self
 
     def __exit__(self, type, value, traceback):
-        self.file.close()
+        self.close()
 
     def keys(self):
         return self.file.keys()
 
     def __getitem__(self, name):
+        self.flush()
         return self.file[name]
 
     def __setitem__(self, name, value):
+        self.flush()
         self.file[name] = value
 
     def __len__(self):
@@ -123,8 +166,22 @@ class StateFile:
     def close(self):
         """
         Close the file.
+
+        If the statefile was created from an `h5py.Group`, the group's file is
+        left open.
+        """
+        self.flush()
+        if isinstance(self.file, h5py.File):
+            self.file.close()
+
+    def flush(self):
         """
-        self.file.close()
+        Write any buffered appended values to the file
+
+        This should be called before reading the `file` attribute directly.
+        """
+        for key in list(self._append_buffers.keys()):
+            self._flush_dataset(key)
 
     ## Convenience functions
     @property
@@ -135,6 +192,7 @@ class StateFile:
         Note the 'size' of the dataset is based on the number of time indices
         that have been written.
         """
+        self.flush()
         if 'time' in self.file:
             return self.file['time'].shape[0]
         else:
@@ -149,6 +207,7 @@ class StateFile:
 
     @property
     def num_controls(self):
+        self.flush()
         num = 1
         control_group = self.file['control']
         for key in self.model.control.keys():
@@ -223,7 +282,9 @@ class StateFile:
             state_group.require_dataset(
                 name, (self.size, ndof),
                 maxshape=(None, ndof), chunks=(self.NCHUNK, ndof),
-                dtype=np.float64
+                dtype=np.float64,
+                compression=self.compression,
+                shuffle=self.compression is not None
             )
 
     def init_control(self):
@@ -234,7 +295,9 @@ class StateFile:
             control_group.require_dataset(
                 name, (self.size, ndof),
                 maxshape=(None, ndof), chunks=(self.NCHUNK, ndof),
-                dtype=np.float64
+                dtype=np.float64,
+                compression=self.compression,
+                shuffle=self.compression is not None
             )
 
     def init_prop(self):
@@ -253,6 +316,55 @@ class StateFile:
             )
 
     ## Functions for writing by appending
+    def _dataset(self, key: str) -> h5py.Dataset:
+        """
+        Return the dataset at path `key`
+
+        Looking up datasets by path has a lot of overhead in `h5py` so dataset
+        objects are cached for the appending functions, which are called
+        every time step.
+        """
+        if key not in self._datasets:
+            self._datasets[key] = self.file[key]
+        return self._datasets[key]
+
+    def _append(self, key: str, value):
+        """
+        Append a row to the dataset at path `key`
+
+        Resizing and writing a dataset one row at a time has a lot of
+        overhead and rewrites the same chunk for each row. Rows are instead
+        buffered in memory and written when they fill the current chunk of
+        the dataset, or when the file is flushed.
+        """
+        if key not in self._append_buffers:
+            dset = self._dataset(key)
+            chunk_size = dset.chunks[0]
+            num_rows = chunk_size - dset.shape[0] % chunk_size
+            self._append_buffers[key] = ([], num_rows)
+
+        rows, num_rows = self._append_buffers[key]
+        # Values are copied since they can be views of a model's arrays
+        if isinstance(value, dfn.GenericVector):
+            rows.append(value.get_local())
+        else:
+            rows.append(np.array(value))
+        if len(rows) == num_rows:
+            self._flush_dataset(key)
+
+    def _flush_dataset(self, key: str):
+        """
+        Write buffered rows to the dataset at path `key`
+        """
+        rows, _ = self._append_buffers.pop(key)
+        if len(rows) > 0:
+            dset = self._dataset(key)
+            start = dset.shape[0]
+            dset.resize(start+len(rows), axis=0)
+            dset[start:] = np.reshape(
+                np.array(rows, dtype=dset.dtype), (len(rows),)+dset.shape[1:]
+            )
+
     def append_state(self, state: bv.BlockVector):
         """
         Append state to the file.
@@ -260,18 +372,12 @@ class StateFile:
         Parameters
         ----------
         """
-        state_group = self.file['state']
         for name, value in state.items():
-            dset = state_group[name]
-            dset.resize(dset.shape[0]+1, axis=0)
-            dset[-1, :] = value
+            self._append(f'state/{name}', value)
 
     def append_control(self, control: bv.BlockVector):
-        control_group = self.file['control']
         for name, value in control.items():
-            dset = control_group[name]
-            dset.resize(dset.shape[0]+1, axis=0)
-            dset[-1] = value
+            self._append(f'control/{name}', value)
 
     def append_prop(self, properties: bv.BlockVector):
         """
@@ -287,6 +393,8 @@ class StateFile:
             # dset.resize(dset.shape[0]+1, axis=0)
             dset[:] = value
 
+        self._prop_values = None
+
     def append_time(self, time: float):
         """
         Append times to the file.
@@ -296,9 +404,7 @@ class StateFile:
         time : float
             Time to append
         """
-        dset = self.file['time']
-        dset.resize(dset.shape[0]+1, axis=0)
-        dset[-1] = time
+        self._append('time', time)
 
     def append_meas_index(self, index: int):
         """
@@ -308,36 +414,36 @@ class StateFile:
         ----------
         index : int
         """
-        dset = self.file['meas_indices']
-        dset.resize(dset.shape[0]+1, axis=0)
-        dset[-1] = index
+        self._append('meas_indices', index)
 
     def append_solver_info(self, solver_info: Mapping[str, Any]):
-        solver_info_group = self.file['solver_info']
-        for key, dset in solver_info_group.items():
-            dset.resize(dset.shape[0]+1, axis=0)
-            if key in solver_info:
-                dset[-1] = solver_info[key]
-            else:
-                dset[-1] = np.nan
+        if self._solver_info_keys is None:
+            self._solver_info_keys = list(self.file['solver_info'].keys())
+        for key in self._solver_info_keys:
+            self._append(
+                f'solver_info/{key}', solver_info.get(key, np.nan)
+            )
 
     ## Functions for reading specific indices
     def get_time(self, n: int) -> float:
         """
         Returns the time at state n.
         """
+        self.flush()
         return self.file['time'][n]
 
     def get_times(self) -> np.ndarray:
         """
         Returns the time vector.
         """
+        self.flush()
         return self.file['time'][:]
 
     def get_meas_indices(self) -> np.ndarray:
         """
         Returns the measured indices.
         """
+        self.flush()
         return self.file['meas_indices'][:]
 
     def get_state(self, n: int) -> bv.BlockVector[np.ndarray]:
@@ -351,6 +457,7 @@ class StateFile:
         out : tuple of 3 dfn.Function
             A set of functions to set vector values for.
         """
+        self.flush()
         state = self.model.state0.copy()
         for key, vec in state.items():
             value = self.dset_chunk_cache[f'state/{key}'].get(n)
@@ -372,6 +479,7 @@ class StateFile:
         out : tuple of 3 dfn.Function
             A set of functions to set vector values for.
         """
+        self.flush()
         control = self.model.control.copy()
         num_controls = self.file[f'control/{control.keys()[0]}'].size
         if n > num_controls-1:
@@ -387,17 +495,30 @@ class StateFile:
         return control
 
     def get_prop(self) -> bv.BlockVector[np.ndarray]:
-        properties = self.model.prop.copy()
+        """
+        Return the properties
+
+        Property values are read from the file on the first call and reused
+        afterwards.
+        """
+        if self._prop_values is None:
+            properties_group = self.file['properties']
+            self._prop_values = {
+                name: properties_group[name][()]
+                for name in self.model.prop.keys()
+            }
 
+        properties = self.model.prop.copy()
         for name, vec in zip(properties.keys(), properties.blocks):
-            dset = self.file[f'properties/{name}']
+            value = self._prop_values[name]
             try:
-                vec[:] = dset[:]
+                vec[:] = value
             except IndexError as e:
-                vec[()] = dset[()]
+                vec[()] = value
         return properties
 
     def get_solver_info(self, n) -> Mapping[str, np.ndarray]:
+        self.flush()
         solver_info_group = self.file['solver_info']
         solver_info = {key: solver_info_group[key][n] for key in solver_info_group.keys()}
         return solver_info
@@ -414,6 +535,7 @@ class StateFile:
         uva : tuple of 3 array_like
             A set of vectors to assign.
         """
+        self.flush()
         for label, value in zip(state.keys(), state.vecs):
             self.file[label][n] = value
 
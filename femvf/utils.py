@@ -10,6 +10,7 @@ from .forward import integrate
 from . import statefile as sf
 
 import numpy as np
+import h5py
 
 
 def line_search(hs, model,
@@ -19,28 +20,43 @@ def line_search(hs, model,
     if path.exists(filepath):
         os.remove(filepath)
 
-    for n, h in enumerate(hs):
-        ## Increment the inputs for the provided step
-        state_n = ini_state + h*dstate
+    # The file is opened once for the whole line search and each step is
+    # written to its own group
+    # Steps are run from largest to smallest so failures, which usually
+    # happen for large steps, show up early; each step is still written to
+    # the group of its index in `hs`
+    with h5py.File(filepath, mode='a', **sf.DEFAULT_CHUNK_CACHE) as h5file:
+        for n in np.argsort(np.abs(hs))[::-1]:
+            h = hs[n]
 
-        controls_n = [control+h*dcontrol for control, dcontrol in zip(controls, dcontrols)]
+            ## Increment the inputs for the provided step
+            # A `None` step direction is zero so that input is left unchanged
+            state_n = ini_state if dstate is None else ini_state + h*dstate
 
-        prop_n = prop + h*dprop
+            if dcontrols is None:
+                controls_n = controls
+            else:
+                controls_n = [
+                    control+h*dcontrol
+                    for control, dcontrol in zip(controls, dcontrols)
+                ]
 
-        times_n = times + h*dtimes
+            prop_n = prop if dprop is None else prop + h*dprop
 
-        ## Run simulations at the step
-        runtime_start = perf_counter()
-        with sf.StateFile(model, filepath, group=f'{n}', mode='a') as f:
-            info = integrate(model, f, state_n, controls_n, prop_n, times_n)
-        runtime_end = perf_counter()
+            times_n = times if dtimes is None else times + h*dtimes
 
-        print(f"Run duration {runtime_end-runtime_start} s")
+            ## Run simulations at the step
+            runtime_start = perf_counter()
+            with sf.StateFile(model, h5file.require_group(f'{n}')) as f:
+                info = integrate(model, f, state_n, controls_n, prop_n, times_n)
+            runtime_end = perf_counter()
 
-        ## Save the run info to a pickled file
-        if h == 0:
-            with open(path.splitext(filepath)[0] + ".pickle", 'wb') as f:
-                pickle.dump(info, f)
+            print(f"Run duration {runtime_end-runtime_start} s")
+
+            ## Save the run info to a pickled file
+            if h == 0:
+                with open(path.splitext(filepath)[0] + ".pickle", 'wb') as f:
+                    pickle.dump(info, f)
 
     return filepath
 
@@ -74,11 +90,23 @@ def line_search_p(hs, model, p, dp, coupling='explicit', filepath='temp.h5'):
 
     return filepath
 
-def functional_on_line_search(hs, functional, model, filepath):
-    functionals = list()
-    for n, h in enumerate(hs):
-        with sf.StateFile(model, filepath, group=f'{n}', mode='r') as f:
-            val = functional(f)
-            functionals.append(val)
+def functionals_on_line_search(hs, functional, model, filepath, f0=None):
+    """
+    Return the functional evaluated at each step of a line search
+
+    The line search file is opened once and each step's group is passed
+    directly to a `StateFile`. If the functional at the start of the line
+    search, `f0`, is known, it's used for any zero steps instead of
+    re-evaluating the functional.
+    """
+    functionals = np.empty(len(hs), dtype=np.float64)
+    with h5py.File(filepath, mode='r', **sf.DEFAULT_CHUNK_CACHE) as h5file:
+        for n, h in enumerate(hs):
+            if h == 0 and f0 is not None:
+                functionals[n] = f0
+                continue
+
+            with sf.StateFile(model, h5file[f'{n}'], mode='r') as f:
+                functionals[n] = functional(f)
 
-    return np.array(functionals)
\ No newline at end of file
+    return functionals
\ No newline at end of file
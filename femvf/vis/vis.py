@@ -6,7 +6,7 @@ import numpy as np
 from matplotlib import tri
 import matplotlib.pyplot as plt
 
-from . import constants
+from .. import constants
 
 def triangulation(model):
     """
@@ -29,20 +29,55 @@ def triangulation(model):
 def init_figure(model, fluid_props):
     """
     Returns a figure and tuple of axes to plot the solution into.
+
+    Returns
+    -------
+    fig, axs
+    artists : dict
+        Artists that are updated for each time by `update_figure`
+    indices : dict
+        Index arrays used by `update_figure`
+
+        These are the vector DOFs of each mesh vertex as a flat array
+        ('vertex_dofs'), the vertices of each mesh cell ('cells') and the FSI
+        surface vertices ('surface_vertices'). They're only created once when
+        plotting a sequence of states.
     """
     gridspec_kw = {'height_ratios': [4, 2, 2], 'width_ratios': [10, 0.5]}
     fig, axs = plt.subplots(3, 2, gridspec_kw=gridspec_kw, figsize=(6, 8))
     axs[0, 0].set_aspect('equal', adjustable='datalim')
 
+    # Initialize artists for the deformed mesh, which are updated in
+    # `update_figure` rather than being re-drawn for each time
+    xy_ref = model.mesh.coordinates()
+    triangulation = tri.Triangulation(
+        xy_ref[:, 0], xy_ref[:, 1], triangles=model.mesh.cells()
+    )
+    mappable = axs[0, 0].tripcolor(
+        triangulation, np.zeros(xy_ref.shape[0]), edgecolors='k', shading='flat'
+    )
+    fig.colorbar(mappable, cax=axs[0, 1])
+    axs[0, 1].set_ylabel('[kPa]')
+
+    artists = {'mesh': mappable}
+    artists['min'], = axs[0, 0].plot([], [], marker='o', mfc='none', color='C0')
+    artists['sep'], = axs[0, 0].plot([], [], marker='o', mfc='none', color='C1')
+    artists['surface'], = axs[0, 0].plot([], [], color='C3')
+    artists['midline'] = axs[0, 0].axhline(y=fluid_props['y_midline'], ls='-.', lw=0.5)
+    artists['contact'] = axs[0, 0].axhline(y=model.ycontact.values()[0], ls='-.', lw=0.5)
+
+    axs[0, 0].set_xlim(-0.2, 1.8, auto=False)
+    axs[0, 0].set_ylim(0.0, 1.0, auto=False)
+
     thickness_bottom = np.amax(model.mesh.coordinates()[..., 0])
 
     x = np.arange(model.fsi_verts.shape[0])
     y = np.arange(model.fsi_verts.shape[0])
 
-    axs[1, 0].plot(x, y, marker='o')
+    artists['pressure'], = axs[1, 0].plot(x, y, marker='o')
 
     # Initialize lines for plotting flow rate and the rate of flow rate
-    axs[2, 0].plot([0], [0])
+    artists['glottal_width'], = axs[2, 0].plot([0], [0])
 
     axs[1, 0].set_xlim(-0.2, 1.4, auto=False)
     p_sub = fluid_props['p_sub'] / constants.PASCAL_TO_CGS
@@ -56,9 +91,17 @@ def init_figure(model, fluid_props):
     for ax in axs[1:, -1]:
         ax.set_axis_off()
 
-    return fig, axs
+    indices = {
+        'vertex_dofs': np.ascontiguousarray(
+            model.solid.vert_to_vdof.reshape(-1), dtype=np.intp
+        ),
+        'cells': np.ascontiguousarray(model.mesh.cells(), dtype=np.intp),
+        'surface_vertices': np.asarray(model.fsi_verts, dtype=np.intp)
+    }
+
+    return fig, axs, artists, indices
 
-def update_figure(fig, axs, model, t, x, fluid_info, solid_props, fluid_props):
+def update_figure(fig, axs, artists, indices, model, t, x, fluid_info, solid_props, fluid_props):
     """
     Plots the FEM solution into a figure.
 
@@ -66,6 +109,8 @@ def update_figure(fig, axs, model, t, x, fluid_info, solid_props, fluid_props):
     ----------
     fig : matplotlib.Figure
     axs : tuple of matplotlib.Axes
+    artists, indices : dict
+        Artists and index arrays from `init_figure`
     x : tuple of dfn.Function
         Kinematic states (u, v, a)
     fluid_props : dict
@@ -75,37 +120,40 @@ def update_figure(fig, axs, model, t, x, fluid_info, solid_props, fluid_props):
     -------
     fig, axs
     """
-    axs[0, 0].clear()
-    delta_xy = x[0].vector()[model.solid.vert_to_vdof.reshape(-1)].reshape(-1, 2)
-    xy_current = model.mesh.coordinates() + delta_xy
-    triangulation = tri.Triangulation(xy_current[:, 0], xy_current[:, 1],
-                                      triangles=model.mesh.cells())
-    mappable = axs[0, 0].tripcolor(triangulation,
-                                   solid_props['elastic_modulus'][model.vert_to_sdof],
-                                   edgecolors='k', shading='flat')
-    fig.colorbar(mappable, cax=axs[0, 1])
-    axs[0, 1].set_ylabel('[kPa]')
-
-    xy_surface = xy_current[model.fsi_verts]
+    # Indexing the local array with `np.take` avoids indexing the `dfn.Vector`
+    # directly, which is much slower; the gathered displacements are then
+    # offset in place to get the current configuration
+    cells = indices['cells']
+    xy_current = np.take(
+        x[0].vector().get_local(), indices['vertex_dofs']
+    ).reshape(-1, 2)
+    xy_current += model.mesh.coordinates()
+
+    # Update the artists created in `init_figure`
+    # Triangle colours are the average of vertex values like `tripcolor` with
+    # `shading='flat'`
+    mesh_artist = artists['mesh']
+    mesh_artist.set_verts(xy_current[cells])
+    emod = solid_props['elastic_modulus'][model.vert_to_sdof]
+    mesh_artist.set_array(emod[cells].mean(axis=1))
+    mesh_artist.autoscale()
+
+    xy_surface = xy_current[indices['surface_vertices']]
 
     xy_min, xy_sep = fluid_info['xy_min'], fluid_info['xy_sep']
-    axs[0, 0].plot(*xy_min, marker='o', mfc='none', color='C0')
-    axs[0, 0].plot(*xy_sep, marker='o', mfc='none', color='C1')
-    axs[0, 0].plot(xy_surface[:, 0], xy_surface[:, 1], color='C3')
+    artists['min'].set_data(*np.reshape(xy_min, (2, 1)))
+    artists['sep'].set_data(*np.reshape(xy_sep, (2, 1)))
+    artists['surface'].set_data(xy_surface[:, 0], xy_surface[:, 1])
+    artists['midline'].set_ydata(2*[fluid_props['y_midline']])
+    artists['contact'].set_ydata(2*[model.ycontact.values()[0]])
 
     axs[0, 0].set_title(f'Time: {1e3*t:>5.1f} ms')
-    axs[0, 0].set_xlim(-0.2, 1.8, auto=False)
-    axs[0, 0].set_ylim(0.0, 1.0, auto=False)
-
-    axs[0, 0].axhline(y=fluid_props['y_midline'], ls='-.', lw=0.5)
-    axs[0, 0].axhline(y=model.ycontact.values()[0], ls='-.', lw=0.5)
 
-    pressure_profile = axs[1, 0].lines[0]
-    pressure_profile.set_data(xy_surface[:, 0], fluid_info['pressure']/constants.PASCAL_TO_CGS)
+    artists['pressure'].set_data(xy_surface[:, 0], fluid_info['pressure']/constants.PASCAL_TO_CGS)
     axs[1, 0].set_xlim(-0.2, 1.8, auto=False)
 
     gw = fluid_props['y_midline'] - np.amax(xy_current[:, 1])
-    line = axs[2, 0].lines[0]
+    line = artists['glottal_width']
     xdata = np.concatenate((line.get_xdata(), [t]), axis=0)
     ydata = np.concatenate((line.get_ydata(), [gw]), axis=0)
     line.set_data(xdata, ydata)
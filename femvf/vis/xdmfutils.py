@@ -4,11 +4,12 @@ Utilities for creating XDMF files
 
 from typing import Union, Tuple, Optional, List, Callable
 
+import copy
+import functools
 from os import path
 
-from xml.etree import ElementTree
-from xml.etree.ElementTree import Element, SubElement
 from lxml import etree
+from lxml.etree import Element, SubElement
 
 import h5py
 import numpy as np
@@ -51,7 +52,7 @@ class XDMFArray:
     def shape(self) -> Shape:
         return self._shape
 
-    @property
+    @functools.cached_property
     def xdmf_shape(self) -> str:
         return r' '.join(str(dim) for dim in self.shape)
 
@@ -64,130 +65,107 @@ class XDMFArray:
         """
         Expand any missing axis indices in an index tuple
         """
-        assert axis_indices.count(Ellipsis) < 2
-
-        # Here, we cut out a chunk `axis_indices[split_start:split_stop]`
-        # and insert default 'slice(None)' slices to fill any missing axis
-        # indices
-        if Ellipsis in axis_indices:
-            # This is the number of missing, explicit, axis indices
-            ndim_expand = ndim - len(axis_indices) + 1
-            # If an ellipsis exists, then add missing axis indices at the
-            # ellipsis
-            split_start = axis_indices.index(Ellipsis)
-            split_stop = split_start+1
-        else:
-            # This is the number of missing, explicit, axis indices
-            ndim_expand = ndim - len(axis_indices)
-            # If no ellipsis exists, then add missing axis indices to the end
-            split_start = len(axis_indices)
-            split_stop = len(axis_indices)
-
-        # Here add `[:]` slices to all missing axis indices
-        expanded_axis_indices = (
-            axis_indices[:split_start]
-            + ndim_expand*(slice(None),)
-            + axis_indices[split_stop:]
+        # This is the number of missing, explicit, axis indices
+        num_missing = ndim - len(axis_indices) + (Ellipsis in axis_indices)
+
+        # Add `[:]` slices for missing axis indices at the ellipsis or, if no
+        # ellipsis exists, at the end
+        expanded_axis_indices = []
+        for axis_index in axis_indices:
+            if axis_index is Ellipsis:
+                assert num_missing >= 0, "Only one `Ellipsis` is allowed"
+                expanded_axis_indices.extend(num_missing*[slice(None)])
+                num_missing = -1
+            else:
+                expanded_axis_indices.append(axis_index)
+        expanded_axis_indices.extend(
+            (ndim-len(expanded_axis_indices))*[slice(None)]
         )
 
         assert len(expanded_axis_indices) == ndim
-        return expanded_axis_indices
-
-    @staticmethod
-    def get_start(axis_index: AxisIndex, axis_size: int):
-        """
-        Return the start of an axis index
-        """
-        if isinstance(axis_index, slice):
-            if axis_index.start is None:
-                start = 0
-            else:
-                start = axis_index.start
-        elif isinstance(axis_index, int):
-            start = axis_index
-        elif axis_index is Ellipsis:
-            raise TypeError("Invalid `Ellipsis` axis index")
-        return start
-
-    @staticmethod
-    def get_stop(axis_index: AxisIndex, axis_size: int):
-        """
-        Return the stop of an axis index
-        """
-        if isinstance(axis_index, slice):
-            if axis_index.stop is None:
-                stop = axis_size
-            else:
-                stop = axis_index.stop
-        elif isinstance(axis_index, int):
-            stop = axis_index + 1
-        elif axis_index is Ellipsis:
-            raise TypeError("Invalid `Ellipsis` axis index")
-        return stop
+        return tuple(expanded_axis_indices)
 
     @staticmethod
-    def get_step(axis_index: AxisIndex, axis_size: int):
+    def axis_index_to_range(axis_index: AxisIndex, axis_size: int) -> range:
         """
-        Return the step of an axis index
+        Return the range of an axis index
         """
         if isinstance(axis_index, slice):
-            if axis_index.step is None:
-                step = 1
-            else:
-                step = axis_index.step
-        elif isinstance(axis_index, int):
-            step = 1
+            return range(*axis_index.indices(axis_size))
         elif axis_index is Ellipsis:
             raise TypeError("Invalid `Ellipsis` axis index")
-        return step
+        else:
+            start = axis_index if axis_index >= 0 else axis_index + axis_size
+            return range(start, start+1)
 
     def to_hyperslab(self, axis_indices: AxisIndices):
         axis_indices = self.expand_axis_indices(axis_indices, self.ndim)
 
-        starts = tuple(
-            self.get_start(axis_index, axis_size)
-            for axis_index, axis_size in zip(axis_indices, self.shape)
-        )
-        steps = tuple(
-            self.get_step(axis_index, axis_size)
+        ranges = [
+            self.axis_index_to_range(axis_index, axis_size)
             for axis_index, axis_size in zip(axis_indices, self.shape)
-        )
-        stops = tuple(
-            self.get_stop(axis_index, axis_size)
+        ]
+        starts = tuple(rng.start for rng in ranges)
+        steps = tuple(rng.step for rng in ranges)
+        counts = tuple(len(rng) for rng in ranges)
+        return starts, steps, counts
+
+    def slice_shape(self, axis_indices: AxisIndices) -> Shape:
+        """
+        Return the shape of the array indexed by `axis_indices`
+
+        This doesn't require reading any array values.
+        """
+        axis_indices = self.expand_axis_indices(axis_indices, self.ndim)
+        return tuple(
+            len(self.axis_index_to_range(axis_index, axis_size))
             for axis_index, axis_size in zip(axis_indices, self.shape)
+            if isinstance(axis_index, slice)
         )
-        counts = tuple(
-            (stop-start)//step
-            for start, stop, step in zip(starts, stops, steps)
-        )
-        return starts, steps, counts
 
     def to_xdmf_hyperslab_str(self, axis_indices: AxisIndices) -> str:
         """
         Return the XDMF array slice string representation of `index`
         """
         starts, steps, counts = self.to_hyperslab(axis_indices)
-        starts = [str(start) for start in starts]
-        steps = [str(step) for step in steps]
-        counts = [str(count) for count in counts]
-        col_widths = [
-            max(len(start), len(step), len(stop))
-            for start, step, stop in zip(starts, steps, counts)
-        ]
-
-        row = ' '.join([f'{{:>{width}s}}' for width in col_widths])
-        return (
-            row.format(*starts) + '\n'
-            + row.format(*steps) + '\n'
-            + row.format(*counts)
+        return '\n'.join(
+            ' '.join(str(value) for value in row)
+            for row in (starts, steps, counts)
         )
 
+# Exported files are written once and then read many times (e.g. by Paraview)
+# so they use the latest file format, which has faster chunk lookups for
+# datasets with many chunks, and paged file space aggregation.
+# NOTE: Files written with `libver='latest'` can't be read by HDF5 < 1.10
+EXPORT_FILE_KWARGS = {
+    'libver': 'latest',
+    'fs_strategy': 'page',
+    'fs_page_size': 1024**2
+}
+
+def open_export_file(fpath: str, mode: str='w', **kwargs) -> h5py.File:
+    """
+    Return a new file for exported mesh values
+
+    Parameters
+    ----------
+    fpath: str
+        The path of the file
+    mode: str
+        The file mode
+    kwargs:
+        Keyword arguments for `h5py.File`, which override `EXPORT_FILE_KWARGS`
+    """
+    kwargs = {**EXPORT_FILE_KWARGS, **kwargs}
+    return h5py.File(fpath, mode=mode, **kwargs)
+
 Format = Union[None, dfn.FunctionSpace]
 def export_mesh_values(
         datasets: List[Union[h5py.Dataset, h5py.Group]],
         formats: List[Format],
         output_group: h5py.Group,
-        output_names: Optional[List[str]]=None
+        output_names: Optional[List[str]]=None,
+        compression: Optional[str]=None
     ):
     """
     Export finite element and other data to mesh based data
@@ -206,6 +184,10 @@ def export_mesh_values(
         which can be plotted by Paraview.
     output_group: h5py.Group
         The group to export data to
+    output_names: Optional[List[str]]
+        The names of the exported datasets
+    compression: Optional[str]
+        A compression filter for formatted datasets (see `export_dataset`)
 
     Returns
     -------
@@ -215,13 +197,25 @@ def export_mesh_values(
     if output_names is None:
         output_names = [dataset.name for dataset in datasets]
 
+    # Datasets often share a format (e.g. 'u', 'v', 'a' use the same function
+    # space) so cache the format functions to only compute dof maps once
+    format_datasets = {}
+
     for dataset_or_group, format, output_name in zip(datasets, formats, output_names):
-        if isinstance(dataset_or_group, h5py.Dataset):
+        if isinstance(dataset_or_group, h5py.Dataset) and format is None:
+            # Raw array data is copied with HDF5's object copy so values
+            # aren't read into memory
             dataset = dataset_or_group
-            format_dataset = make_format_dataset(format)
+            dataset.parent.copy(dataset, output_group, name=output_name)
+        elif isinstance(dataset_or_group, h5py.Dataset):
+            dataset = dataset_or_group
+            if id(format) not in format_datasets:
+                format_datasets[id(format)] = make_format_dataset(format)
+            format_dataset = format_datasets[id(format)]
             export_dataset(
                 dataset, output_group,
-                output_dataset_name=output_name, format_dataset=format_dataset
+                output_dataset_name=output_name, format_dataset=format_dataset,
+                compression=compression
             )
         elif isinstance(dataset_or_group, h5py.Group):
             input_group = dataset_or_group
@@ -260,52 +254,194 @@ def make_format_dataset(
             ent_dim = mesh.topology().dim()
         else:
             raise ValueError()
-        mesh_to_dof = np.array(
-            dofmap.entity_dofs(mesh, ent_dim, mesh_ent_dofs)
+        # The gather indices are converted to `np.intp` once here so
+        # formatting a dataset is a single `np.take`
+        mesh_to_dof = np.asarray(
+            dofmap.entity_dofs(mesh, ent_dim, mesh_ent_dofs), dtype=np.intp
         )
 
         # This determines whether the function space is vector/scalar and
         # how many components
         value_dim = max(function_space.num_sub_spaces(), 1)
+
+        # If DOFs are already ordered by mesh entity, formatting only needs a
+        # reshape
+        is_identity = np.array_equal(mesh_to_dof, np.arange(mesh_to_dof.size))
         def format_dataset(dataset: h5py.Dataset):
-            array = dataset[()][..., mesh_to_dof]
-            new_shape = (
-                array.shape[:-1] + (array.shape[-1]//value_dim,) + (value_dim,)
-            )
-            array = np.reshape(array, new_shape)
-            return array
+            array = dataset[()]
+            if not (is_identity and array.shape[-1] == mesh_to_dof.size):
+                array = np.take(array, mesh_to_dof, axis=-1)
+            return array.reshape(array.shape[:-1] + (-1, value_dim))
     else:
         def format_dataset(dataset: h5py.Dataset):
             return dataset[()]
     return format_dataset
 
+# Target size of the blocks that datasets are exported in and of the chunks
+# of exported datasets
+EXPORT_BLOCK_NBYTES = 8*1024**2
+EXPORT_CHUNK_NBYTES = 1024**2
+
 def export_dataset(
         input_dataset: h5py.Dataset,
         output_group: h5py.Group, output_dataset_name=None,
-        format_dataset=None
+        format_dataset=None,
+        block_size: Optional[int]=None,
+        chunks: Optional[Tuple[int, ...]]=None,
+        compression: Optional[str]=None
     ):
+    """
+    Export a dataset to an output group
+
+    Datasets with more than one axis are read, formatted, and written in
+    blocks along the first (usually time) axis. This avoids writing one index
+    at a time and holding the whole dataset in memory.
+
+    Parameters
+    ----------
+    input_dataset: h5py.Dataset
+        The dataset to export
+    output_group: h5py.Group
+        The group to export the dataset to
+    output_dataset_name: Optional[str]
+        The name of the exported dataset
+    format_dataset: Optional[FormatDataset]
+        A function that formats the dataset values. This must only act on
+        axes after the first one.
+    block_size: Optional[int]
+        The number of indices along the first axis in each block. By default,
+        this is chosen so that blocks are about `EXPORT_BLOCK_NBYTES` in size
+        and contain whole chunks of the input dataset.
+    chunks: Optional[Tuple[int, ...]]
+        The chunk shape of the exported dataset. By default, datasets exported
+        in blocks are chunked along the first axis with chunks of about
+        `EXPORT_CHUNK_NBYTES` in size, so that reading a single index along
+        the first axis reads only a few chunks.
+    compression: Optional[str]
+        A compression filter for the exported dataset (for example, 'lzf').
+        The shuffle filter is applied along with any compression filter.
+    """
     if output_dataset_name is None:
         output_dataset_name = input_dataset.name
     if format_dataset is None:
-        format_dataset = lambda x: x
+        format_dataset = lambda x: x[()]
 
-    dataset = output_group.create_dataset(
-        output_dataset_name, data=format_dataset(input_dataset)
+    size = input_dataset.shape[0] if input_dataset.ndim > 1 else 0
+    if size == 0:
+        return output_group.create_dataset(
+            output_dataset_name, data=format_dataset(input_dataset)
+        )
+
+    if block_size is None:
+        row_nbytes = input_dataset.dtype.itemsize*np.prod(input_dataset.shape[1:])
+        block_size = max(int(EXPORT_BLOCK_NBYTES // max(row_nbytes, 1)), 1)
+
+        # Align blocks with whole chunks of the input so each chunk is only
+        # read (and decompressed) once
+        if input_dataset.chunks is not None:
+            chunk_size = input_dataset.chunks[0]
+            block_size = max(block_size//chunk_size, 1)*chunk_size
+    block_size = min(block_size, size)
+
+    # Input blocks are read directly into one reusable buffer
+    input_block = np.empty(
+        (block_size,)+input_dataset.shape[1:], dtype=input_dataset.dtype
     )
+    def read_block(start):
+        stop = min(start+block_size, size)
+        input_dataset.read_direct(
+            input_block, np.s_[start:stop], np.s_[:stop-start]
+        )
+        return input_block[:stop-start]
+
+    dataset = None
+    for start in range(0, size, block_size):
+        block = format_dataset(read_block(start))
+        if dataset is None:
+            dataset = create_row_chunked_dataset(
+                output_group, output_dataset_name, size, block,
+                chunks=chunks, compression=compression
+            )
+        write_rows(dataset, start, block)
     return dataset
 
+def create_row_chunked_dataset(
+        output_group: h5py.Group, output_dataset_name: str,
+        size: int, block: np.ndarray,
+        chunks: Optional[Tuple[int, ...]]=None,
+        compression: Optional[str]=None
+    ):
+    """
+    Create a dataset for rows like `block`, chunked along the first axis
+    """
+    if chunks is None:
+        row_nbytes = block.dtype.itemsize*np.prod(block.shape[1:])
+        chunk_size = min(
+            max(int(EXPORT_CHUNK_NBYTES // max(row_nbytes, 1)), 1), size
+        )
+        chunks = (chunk_size,)+block.shape[1:]
+    return output_group.create_dataset(
+        output_dataset_name,
+        shape=(size,)+block.shape[1:], dtype=block.dtype,
+        chunks=chunks,
+        compression=compression,
+        shuffle=compression is not None
+    )
+
+def write_rows(dataset: h5py.Dataset, start: int, block: np.ndarray):
+    """
+    Write `block` to `dataset` starting at index `start` of the first axis
+
+    Whole chunks of unfiltered datasets that are chunked by rows are written
+    with `write_direct_chunk`, which skips the HDF5 filter pipeline. Any
+    remaining rows are written with a regular slice assignment.
+    """
+    stop = start + block.shape[0]
+    chunk_size = dataset.chunks[0]
+    use_direct_chunks = (
+        dataset.chunks[1:] == dataset.shape[1:]
+        and dataset.id.get_create_plist().get_nfilters() == 0
+    )
+
+    if use_direct_chunks:
+        chunk_start = min(-(-start // chunk_size)*chunk_size, stop)
+    else:
+        chunk_start = stop
+    if chunk_start > start:
+        dataset[start:chunk_start] = block[:chunk_start-start]
+
+    chunk_offset = (0,)*(dataset.ndim-1)
+    n = chunk_start
+    while n+chunk_size <= stop:
+        chunk = np.ascontiguousarray(
+            block[n-start:n-start+chunk_size], dtype=dataset.dtype
+        )
+        dataset.id.write_direct_chunk((n,)+chunk_offset, chunk)
+        n += chunk_size
+
+    if n < stop:
+        dataset[n:stop] = block[n-start:]
+
 def export_group(
         input_group: h5py.Group,
         output_group: h5py.Group,
         idx=None
     ):
+    """
+    Export the datasets in a group to an output group
 
+    Unformatted datasets (`idx=None`) are copied with HDF5's object copy so
+    their values aren't read into memory.
+    """
     for key, dataset in input_group.items():
         if isinstance(dataset, h5py.Dataset):
-            export_dataset(
-                dataset, output_group, output_dataset_name=key,
-                format_dataset=idx
-            )
+            if idx is None:
+                input_group.copy(dataset, output_group, name=key)
+            else:
+                export_dataset(
+                    dataset, output_group, output_dataset_name=key,
+                    format_dataset=idx
+                )
     return output_group
 
 
@@ -362,55 +498,98 @@ def write_xdmf(
     if temporal_dataset_idxs is None:
         temporal_dataset_idxs = []
 
-    root = Element('Xdmf')
-    root.set('version', '2.0')
-
-    domain = SubElement(root, 'Domain')
-
     if xdmf_fpath is None:
         xdmf_basename = path.splitext(path.basename(mesh_group.file.filename))[0]
         xdmf_fpath = f'{xdmf_basename}.xdmf'
     xdmf_dir, xdmf_basename = path.split(xdmf_fpath)
 
+    # The static part of the domain is built as a tree while temporal grids
+    # are written incrementally (see below)
+    domain = Element('Domain')
+
+    ## Add mesh info shared by all grids
+    # Grids reference this single copy of the mesh instead of repeating the
+    # topology/geometry for every time step
+    mesh_dim = mesh_group['dim'][()]
+    add_xdmf_grid_topology(
+        domain, mesh_group['connectivity'], mesh_dim, xdmf_dir=xdmf_dir,
+        name='MeshTopology'
+    )
+    add_xdmf_grid_geometry(
+        domain, mesh_group['coordinates'], mesh_dim, xdmf_dir=xdmf_dir,
+        name='MeshGeometry'
+    )
+    mesh_refs = (
+        "/Xdmf/Domain/Topology[@Name='MeshTopology']",
+        "/Xdmf/Domain/Geometry[@Name='MeshGeometry']"
+    )
+
     ## Add info for a static grid
     grid = add_xdmf_uniform_grid(
         domain, 'Static',
         mesh_group,
         static_dataset_descrs, static_dataset_idxs,
-        xdmf_dir=xdmf_dir
+        xdmf_dir=xdmf_dir, mesh_refs=mesh_refs
     )
 
     ## Add info for a time-varying Grid
     if time_dataset is not None:
-        n_time = time_dataset.size
-        temporal_grid = SubElement(
-            domain, 'Grid', {
-                'GridType': 'Collection',
-                'CollectionType': 'Temporal',
-                'Name': 'Temporal'
-            }
-        )
-        for ii in range(n_time):
-            # Temporal dataset indices are assumed to apply to the non-time
-            # axes and the time axis is assumed to be the first one
-            _temporal_dataset_idxs = [
-                (ii,)+idx for idx in temporal_dataset_idxs
-            ]
-            grid = add_xdmf_uniform_grid(
-                temporal_grid, f'Time{ii}',
+        times = time_dataset[:]
+        n_time = times.size
+        # Grids at each time only differ in the time value and the time index
+        # of dataset hyperslabs so a prototype grid is built once and copied
+        # for each time
+        # Temporal dataset indices are assumed to apply to the non-time
+        # axes and the time axis is assumed to be the first one
+        if n_time > 0:
+            prototype_grid = add_xdmf_uniform_grid(
+                Element('Grid'), 'Time0',
                 mesh_group,
-                temporal_dataset_descrs, _temporal_dataset_idxs,
-                time=time_dataset[ii], xdmf_dir=xdmf_dir
+                temporal_dataset_descrs,
+                [(0,)+idx for idx in temporal_dataset_idxs],
+                time=times[0], xdmf_dir=xdmf_dir, mesh_refs=mesh_refs
             )
 
-    ## Write the XDMF file
-    lxml_root = etree.fromstring(ElementTree.tostring(root))
-    etree.indent(lxml_root, space="    ")
-    pretty_xml = etree.tostring(lxml_root, pretty_print=True)
+        # Only the first (time) start of each hyperslab selection changes
+        # between times so the selection text is precomputed as a template
+        slice_sel_templates = []
+        for (dataset, *_), idx in zip(temporal_dataset_descrs, temporal_dataset_idxs):
+            starts, steps, counts = XDMFArray(dataset.shape).to_hyperslab((0,)+idx)
+            rows = (
+                ('{}',) + tuple(str(start) for start in starts[1:]),
+                tuple(str(step) for step in steps),
+                tuple(str(count) for count in counts)
+            )
+            slice_sel_templates.append('\n'.join(' '.join(row) for row in rows))
 
+        def make_temporal_grid(ii):
+            grid = copy.deepcopy(prototype_grid)
+            grid.set('Name', f'Time{ii}')
+            grid.find('Time').set('Value', f'{times[ii]}')
+            slice_sels = grid.findall("Attribute/DataItem/DataItem[@Format='XML']")
+            for slice_sel, template in zip(slice_sels, slice_sel_templates):
+                slice_sel.text = template.format(ii)
+            return grid
 
-    with open(xdmf_fpath, 'wb') as fxml:
-        fxml.write(pretty_xml)
+    ## Write the XDMF file
+    # Temporal grids are written one at a time so the full document is never
+    # held in memory
+    with etree.xmlfile(xdmf_fpath, encoding='utf-8') as xf:
+        xf.write_declaration()
+        with xf.element('Xdmf', {'version': '2.0'}):
+            with xf.element('Domain'):
+                for element in domain:
+                    xf.write(element, pretty_print=True)
+
+                if time_dataset is not None:
+                    temporal_grid_attrs = {
+                        'GridType': 'Collection',
+                        'CollectionType': 'Temporal',
+                        'Name': 'Temporal'
+                    }
+                    with xf.element('Grid', temporal_grid_attrs):
+                        for ii in range(n_time):
+                            xf.write(make_temporal_grid(ii), pretty_print=True)
 
     return xdmf_fpath
 
@@ -421,8 +600,20 @@ def add_xdmf_uniform_grid(
         dataset_descrs: List[DatasetDescription],
         dataset_idxs: List[AxisIndices],
         time: float=None,
-        xdmf_dir: str='.'
+        xdmf_dir: str='.',
+        mesh_refs: Optional[Tuple[str, str]]=None
     ):
+    """
+    Add a uniform grid with mesh and dataset info
+
+    Parameters
+    ----------
+    mesh_refs: Optional[Tuple[str, str]]
+        XPaths to existing topology and geometry elements
+
+        If supplied, the grid references these elements instead of writing
+        its own copy of the mesh.
+    """
     grid = SubElement(
         parent, 'Grid', {
             'GridType': 'Uniform',
@@ -439,13 +630,20 @@ def add_xdmf_uniform_grid(
         )
 
     # Write mesh info to grid
-    mesh_dim = mesh_group['dim'][()]
-    add_xdmf_grid_topology(
-        grid, mesh_group['connectivity'], mesh_dim, xdmf_dir=xdmf_dir
-    )
-    add_xdmf_grid_geometry(
-        grid, mesh_group['coordinates'], mesh_dim, xdmf_dir=xdmf_dir
-    )
+    if mesh_refs is None:
+        mesh_dim = mesh_group['dim'][()]
+        add_xdmf_grid_topology(
+            grid, mesh_group['connectivity'], mesh_dim, xdmf_dir=xdmf_dir
+        )
+        add_xdmf_grid_geometry(
+            grid, mesh_group['coordinates'], mesh_dim, xdmf_dir=xdmf_dir
+        )
+    else:
+        topology_ref, geometry_ref = mesh_refs
+        topo = SubElement(grid, 'Topology', {'Reference': 'XML'})
+        topo.text = topology_ref
+        geom = SubElement(grid, 'Geometry', {'Reference': 'XML'})
+        geom.text = geometry_ref
 
     # Write arrays to grid
     for (dataset, value_type, value_center), idx in zip(
@@ -459,8 +657,18 @@ def add_xdmf_uniform_grid(
 
     return grid
 
+def xdmf_hdf_path(dataset: h5py.Dataset, xdmf_dir: str='.') -> str:
+    """
+    Return the XDMF reference to an HDF5 dataset, relative to `xdmf_dir`
+    """
+    # NOTE: `dataset.file` creates a new `h5py.File` object on each access
+    # so it's only accessed once here
+    fpath = dataset.file.filename
+    return f'{path.relpath(fpath, start=xdmf_dir)}:{dataset.name}'
+
 def add_xdmf_grid_topology(
-        grid: Element, dataset: h5py.Dataset, mesh_dim=2, xdmf_dir='.'
+        grid: Element, dataset: h5py.Dataset, mesh_dim=2, xdmf_dir='.',
+        name: Optional[str]=None
     ):
 
     if mesh_dim == 3:
@@ -476,6 +684,8 @@ def add_xdmf_grid_topology(
             'NumberOfElements': f'{N_CELL}'
         }
     )
+    if name is not None:
+        topo.set('Name', name)
 
     xdmf_array = XDMFArray(dataset.shape)
     conn = SubElement(
@@ -487,13 +697,11 @@ def add_xdmf_grid_topology(
             'Dimensions': xdmf_array.xdmf_shape
         }
     )
-    conn.text = (
-        f'{path.relpath(dataset.file.filename, start=xdmf_dir)}'
-        f':{dataset.name}'
-    )
+    conn.text = xdmf_hdf_path(dataset, xdmf_dir)
 
 def add_xdmf_grid_geometry(
-        grid: Element, dataset: h5py.Dataset, mesh_dim=2, xdmf_dir='.'
+        grid: Element, dataset: h5py.Dataset, mesh_dim=2, xdmf_dir='.',
+        name: Optional[str]=None
     ):
     if mesh_dim == 3:
         geometry_type = 'XYZ'
@@ -501,6 +709,8 @@ def add_xdmf_grid_geometry(
         geometry_type = 'XY'
 
     geom = SubElement(grid, 'Geometry', {'GeometryType': geometry_type})
+    if name is not None:
+        geom.set('Name', name)
 
     xdmf_array = XDMFArray(dataset.shape)
     coords = SubElement(
@@ -513,10 +723,7 @@ def add_xdmf_grid_geometry(
             'Dimensions': xdmf_array.xdmf_shape
         }
     )
-    coords.text = (
-        f'{path.relpath(dataset.file.filename, start=xdmf_dir)}'
-        f':{dataset.name}'
-    )
+    coords.text = xdmf_hdf_path(dataset, xdmf_dir)
 
 def add_xdmf_grid_array(
         grid: Element,
@@ -535,25 +742,25 @@ def add_xdmf_grid_array(
         }
     )
 
-    shape = dataset.shape
-
-    xdmf_array = XDMFArray(dataset[axis_indices].shape)
+    if axis_indices is None:
+        axis_indices = (...,)
+    xdmf_array = XDMFArray(dataset.shape)
+    slice_array = XDMFArray(xdmf_array.slice_shape(axis_indices))
     data_subset = SubElement(
         comp, 'DataItem', {
             'ItemType': 'HyperSlab',
             'NumberType': 'Float',
             'Precision': '8',
             'Format': 'HDF',
-            'Dimensions': xdmf_array.xdmf_shape
+            'Dimensions': slice_array.xdmf_shape
         }
     )
     slice_sel = SubElement(
         data_subset, 'DataItem', {
-            'Dimensions': f'3 {len(shape):d}',
+            'Dimensions': f'3 {xdmf_array.ndim:d}',
             'Format': 'XML'
         }
     )
-    xdmf_array = XDMFArray(shape)
     slice_sel.text = xdmf_array.to_xdmf_hyperslab_str(axis_indices)
 
     slice_data = SubElement(
@@ -563,10 +770,7 @@ def add_xdmf_grid_array(
         }
     )
 
-    slice_data.text = (
-        f'{path.relpath(dataset.file.filename, start=xdmf_dir)}'
-        f':{dataset.name}'
-    )
+    slice_data.text = xdmf_hdf_path(dataset, xdmf_dir)
     return comp
 
 def add_xdmf_grid_finite_element_function(
@@ -586,7 +790,7 @@ def add_xdmf_grid_finite_element_function(
             'Center': 'Other',
             'ItemType': 'FiniteElementFunction',
             'ElementFamily': elem_family,
-            'ElementDegree': elem_degree,
+            'ElementDegree': f'{elem_degree}',
             'ElementCell': elem_cell
         }
     )
@@ -601,27 +805,28 @@ def add_xdmf_grid_finite_element_function(
             'Dimensions': xdmf_array.xdmf_shape
         }
     )
-    dofmap.text = f'{dataset_dofmap.file.filename}:{dataset_dofmap.name}'
+    dofmap.text = xdmf_hdf_path(dataset_dofmap, xdmf_dir)
 
-    xdmf_array = XDMFArray(dataset[axis_indices].shape)
+    if axis_indices is None:
+        axis_indices = (...,)
+    xdmf_array = XDMFArray(dataset.shape)
+    slice_array = XDMFArray(xdmf_array.slice_shape(axis_indices))
     data_subset = SubElement(
         comp, 'DataItem', {
             'ItemType': 'HyperSlab',
             'NumberType': 'Float',
             'Precision': '8',
             'Format': 'HDF',
-            'Dimensions': xdmf_array.xdmf_shape
+            'Dimensions': slice_array.xdmf_shape
         }
     )
 
-    shape = dataset.shape
     slice_sel = SubElement(
         data_subset, 'DataItem', {
-            'Dimensions': f'3 {len(shape)}',
+            'Dimensions': f'3 {xdmf_array.ndim:d}',
             'Format': 'XML'
         }
     )
-    xdmf_array = XDMFArray(shape)
     slice_sel.text = xdmf_array.to_xdmf_hyperslab_str(axis_indices)
 
     slice_data = SubElement(
@@ -630,7 +835,4 @@ def add_xdmf_grid_finite_element_function(
             'Format': 'HDF'
         }
     )
-    slice_data.text = (
-        f'{path.relpath(dataset.file.filename, start=xdmf_dir)}'
-        f':{dataset.name}'
-    )
+    slice_data.text = xdmf_hdf_path(dataset, xdmf_dir)
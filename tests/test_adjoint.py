@@ -17,10 +17,10 @@ from time import perf_counter
 import unittest
 
 import numpy as np
-import matplotlib.pyplot as plt
 import dolfin as dfn
+from blockarray import blockvec as vec
 
-from femvf import statefile as sf, linalg
+from femvf import statefile as sf
 
 from femvf.models import (
     Rayleigh, KelvinVoigt, Bernoulli, WRAnalog)
@@ -31,7 +31,6 @@ from femvf import adjoint
 from femvf.constants import PASCAL_TO_CGS
 from femvf.parameters import parameterization
 from femvf.functional import solid as fsolid, fluid as ffluid, acoustic as facous
-from femvf import linalg
 
 from femvf.utils import line_search, line_search_p, functionals_on_line_search
 
@@ -41,17 +40,27 @@ from modeldefs import (
 # from optvf import functional as extra_funcs
 
 dfn.set_log_level(30)
-np.random.seed(123)
 
 def taylor_order(f0, hs, fs,
                  gstate, gcontrols, gprops, gtimes,
                  dstate, dcontrols, dprop, dtimes):
 
     ## Project the gradient along the step direction
-    directions = vec.concatenate_vec([dstate, dprop, dtimes, *dcontrols])
-    gradients = vec.concatenate_vec([gstate, gprops, gtimes, *gcontrols])
-
-    grad_step = linalg.dot(directions, gradients)
+    # The projection is summed over each input so the directions and gradients
+    # don't have to be concatenated into single vectors; `None` directions
+    # are zero and are skipped
+    grad_step = 0.0
+    if dstate is not None:
+        grad_step += vec.dot(dstate, gstate)
+    if dcontrols is not None:
+        grad_step += sum(
+            vec.dot(dcontrol, gcontrol)
+            for dcontrol, gcontrol in zip(dcontrols, gcontrols)
+        )
+    if dprop is not None:
+        grad_step += vec.dot(dprop, gprops)
+    if dtimes is not None:
+        grad_step += vec.dot(dtimes, gtimes)
     grad_step_fd = (fs - f0)/hs
     # breakpoint()
 
@@ -59,15 +68,41 @@ def taylor_order(f0, hs, fs,
     remainder_1 = np.abs(fs - f0)
     remainder_2 = np.abs((fs - f0) - hs*grad_step)
 
-    order_1 = np.log(remainder_1[1:]/remainder_1[:-1]) / np.log(2)
-    order_2 = np.log(remainder_2[1:]/remainder_2[:-1]) / np.log(2)
+    order_1 = np.diff(np.log2(remainder_1))
+    order_2 = np.diff(np.log2(remainder_2))
     return (order_1, order_2), (grad_step, grad_step_fd)
 
 class TaylorTest(unittest.TestCase):
 
+    # Baseline functionals and gradients for each case; `setUp` runs before
+    # every test method so this stops the baseline forward and adjoint
+    # simulations from being repeated for each test
+    _BASELINES = {}
+
+    @classmethod
+    def init_mesh_arrays(cls):
+        """
+        Cache mesh arrays used to build step directions in each test
+        """
+        model = cls.model
+        xy = model.get_ref_config()[dfn.dof_to_vertex_map(model.solid.scalar_fspace)]
+        y = xy[:, 1]
+        cls.y_frac = (y-y.min()) / (y.max()-y.min())
+
+        cls.surface_dofs = model.solid.vert_to_vdof.reshape(-1, 2)[model.fsi_verts]
+        cls.xy_surface = model.solid.mesh.coordinates()[model.fsi_verts, :]
+
+        # Scratch vectors that step directions are built in
+        cls.step_dir = dfn.Function(model.solid.vector_fspace).vector()
+        cls.step_dir_local = np.zeros(cls.step_dir.local_size())
+
     def compute_baseline(self):
         ## Compute the baseline forward simulation and functional/gradient at the baseline (via adjoint)
         base_path = f"out/{self.CASE_NAME}-0.h5"
+        key = (type(self).__name__, base_path, self.FUNCTIONAL)
+        if key in TaylorTest._BASELINES:
+            return TaylorTest._BASELINES[key]
+
         if self.OVERWRITE_LSEARCH or not os.path.isfile(base_path):
             if os.path.isfile(base_path):
                 os.remove(base_path)
@@ -83,30 +118,16 @@ class TaylorTest(unittest.TestCase):
 
         print(f"Duration {perf_counter()-t_start:.4f} s")
 
+        TaylorTest._BASELINES[key] = (f0, grads)
         return f0, grads
 
     def get_taylor_order(self, lsearch_fname, hs,
                          dstate=None, dcontrols=None, dprop=None, dtimes=None):
         """
         Runs the taylor order test along the specified direction
-        """
-        ## Set a zero search direction if one isn't specified
-        if dstate is None:
-            dstate = self.model.state0.copy()
-            dstate[:] = 0.0
-
-        if dcontrols is None:
-            dcontrols = [self.model.control.copy()]
-            dcontrols[0][:] = 0.0
-
-        if dprop is None:
-            dprop = self.model.prop.copy()
-            dprop[:] = 0.0
-
-        if dtimes is None:
-            dtimes = self.times.copy()
-            dtimes[:] = 0.0
 
+        Any unspecified step direction is zero.
+        """
         ## Conduct a line search along the specified direction
         if self.OVERWRITE_LSEARCH or not os.path.exists(lsearch_fname):
             if os.path.exists(lsearch_fname):
@@ -117,7 +138,9 @@ class TaylorTest(unittest.TestCase):
         else:
             print("Line search simulations already exist. Using existing files.")
 
-        fs = functionals_on_line_search(hs, self.functional, self.model, lsearch_fname)
+        fs = functionals_on_line_search(
+            hs, self.functional, self.model, lsearch_fname, f0=self.f0
+        )
         assert not np.all(fs == self.f0) # Check that f actually changes along the step direction
 
         ## Compute the taylor convergence order
@@ -138,6 +161,8 @@ class TaylorTest(unittest.TestCase):
         return (order_1, order_2)
 
     def plot_taylor_convergence(self, grad_on_step_dir, h, g):
+        import matplotlib.pyplot as plt
+
         # Plot the adjoint gradient and finite difference approximations of the gradient
         fig, ax = plt.subplots(1, 1, constrained_layout=True)
         ax.plot(h[1:], (g[1:] - g[0])/h[1:],
@@ -153,6 +178,8 @@ class TaylorTest(unittest.TestCase):
         """
         Plot the (u, v, a) initial state gradients
         """
+        import matplotlib.pyplot as plt
+
         tri = model.get_triangulation()
         fig, axs = plt.subplots(3, 2, constrained_layout=True)
         for ii, (grad, label) in enumerate(zip(grad_uva, ['u0', 'v0', 'a0'])):
@@ -174,9 +201,17 @@ class TestBasicGradient(TaylorTest):
     FUNCTIONAL = ffluid.AvgAcousticPower
     # FUNCTIONAL = ffluid.SubglottalPower
 
+    @classmethod
+    def setUpClass(cls):
+        ## Load the model
+        # Loading a model compiles its forms so this is only done once per class
+        cls.model, cls.prop = load_fsi_kelvinvoigt_model(cls.COUPLING)
+        # cls.model, cls.prop = get_starting_fsai_model(cls.COUPLING)
+        cls.init_mesh_arrays()
+
     def setUp(self):
         """
-        Set the model, parameters, functional to test, and the gradient/forward model at the
+        Set the parameters, functional to test, and the gradient/forward model at the
         baseline parameter set
 
         This should set the starting point of the line search; all the parameters needed to solve
@@ -184,10 +219,6 @@ class TestBasicGradient(TaylorTest):
         """
         self.CASE_NAME = 'singleperiod'
 
-        ## Load the model
-        self.model, self.prop = load_fsi_kelvinvoigt_model(self.COUPLING)
-        # self.model, self.prop = get_starting_fsai_model(self.COUPLING)
-
         ## Set baseline parameters (point the model is linearized around)
         t_start, t_final = 0, 0.01
         times_meas = np.linspace(t_start, t_final, 32)
@@ -232,14 +263,20 @@ class TestBasicGradient(TaylorTest):
         # step_dir[1::2] = -(y-y.min()) / (y.max()-y.min())
 
         # Increment `u` only along the pressure surface
-        surface_dofs = self.model.solid.vert_to_vdof.reshape(-1, 2)[self.model.fsi_verts]
-        xy_surface = self.model.solid.mesh.coordinates()[self.model.fsi_verts, :]
+        surface_dofs = self.surface_dofs
+        xy_surface = self.xy_surface
         x_surf, y_surf = xy_surface[:, 0], xy_surface[:, 1]
-        step_dir = dfn.Function(self.model.solid.vector_fspace).vector()
+        step_dir = self.step_dir
 
+        # Fill the step direction as a numpy array and set it in one call,
+        # rather than indexing the `dfn.Vector` repeatedly
         x_frac = (x_surf-x_surf.min())/(x_surf.max()-x_surf.min())
-        step_dir[np.array(surface_dofs[:, 0])] = 1*(1.0-x_frac) + 0.25*x_frac
-        step_dir[np.array(surface_dofs[:, 1])] = -1*(1.0-x_frac) + 0.25*x_frac
+        _step_dir = self.step_dir_local
+        _step_dir[:] = 0.0
+        _step_dir[surface_dofs[:, 0]] = 1*(1.0-x_frac) + 0.25*x_frac
+        _step_dir[surface_dofs[:, 1]] = -1*(1.0-x_frac) + 0.25*x_frac
+        step_dir.set_local(_step_dir)
+        step_dir.apply('insert')
         # step_dir[np.array(surface_dofs[:, 0])] = (y_surf/y_surf.max())**2
         # step_dir[np.array(surface_dofs[:, 1])] = (y_surf/y_surf.max())**2
 
@@ -260,16 +297,13 @@ class TestBasicGradient(TaylorTest):
         save_path = f'out/linesearch_v0_{self.COUPLING}.h5'
         hs = 2.0**(np.arange(2, 9)-9)
 
-        xy = self.model.get_ref_config()[dfn.dof_to_vertex_map(self.model.solid.scalar_fspace)]
-        y = xy[:, 1]
-
         # Set the step direction as a linear (de)increase in x and y displacement in the y direction
         # step_dir = np.zeros(xy.size)
-        step_dir = dfn.Function(self.model.solid.vector_fspace).vector()
-        _step_dir = step_dir[:].copy()
-        _step_dir[:-1:2] = -(y-y.min()) / (y.max()-y.min())
-        _step_dir[1::2] = -(y-y.min()) / (y.max()-y.min())
-        step_dir[:] = _step_dir
+        step_dir = self.step_dir
+        _step_dir = self.step_dir_local
+        _step_dir.reshape(-1, 2)[:] = -self.y_frac[:, None]
+        step_dir.set_local(_step_dir)
+        step_dir.apply('insert')
 
         self.model.solid.forms['bc.dirichlet'].apply(step_dir)
         dstate = self.model.state0.copy()
@@ -283,15 +317,12 @@ class TestBasicGradient(TaylorTest):
         save_path = f'out/linesearch_a0_{self.COUPLING}.h5'
         hs = 2.0**(np.arange(2, 9))
 
-        xy = self.model.get_ref_config()[dfn.dof_to_vertex_map(self.model.solid.scalar_fspace)]
-        y = xy[:, 1]
-
         # Set the step direction as a linear (de)increase in x and y displacement in the y direction
-        step_dir = dfn.Function(self.model.solid.vector_fspace).vector()
-        _step_dir = step_dir[:].copy()
-        _step_dir[:-1:2] = -(y-y.min()) / (y.max()-y.min())
-        _step_dir[1::2] = -(y-y.min()) / (y.max()-y.min())
-        step_dir[:] = _step_dir
+        step_dir = self.step_dir
+        _step_dir = self.step_dir_local
+        _step_dir.reshape(-1, 2)[:] = -self.y_frac[:, None]
+        step_dir.set_local(_step_dir)
+        step_dir.apply('insert')
 
         self.model.solid.forms['bc.dirichlet'].apply(step_dir)
         dstate = self.model.state0.copy()
@@ -334,9 +365,16 @@ class TestBasicGradientSingleStep(TaylorTest):
     # FUNCTIONAL = ffluid.FinalPressureNorm
     FUNCTIONAL = ffluid.FinalFlowRateNorm
 
+    @classmethod
+    def setUpClass(cls):
+        ## Load the model
+        # cls.model, cls.prop = get_starting_kelvinvoigt_model(cls.COUPLING)
+        cls.model, cls.prop = load_fsai_rayleigh_model(cls.COUPLING)
+        cls.init_mesh_arrays()
+
     def setUp(self):
         """
-        Set the model and baseline simulation parameters
+        Set the baseline simulation parameters
 
         This should set the starting point of the line search; all the parameters needed to solve
         a single simulation are given by this set up.
@@ -344,8 +382,6 @@ class TestBasicGradientSingleStep(TaylorTest):
         self.CASE_NAME = 'singlestep'
 
         ## parameter set
-        # self.model, self.prop = get_starting_kelvinvoigt_model(self.COUPLING)
-        self.model, self.prop = load_fsai_rayleigh_model(self.COUPLING)
         self.model.set_prop(self.prop)
 
         t_start, t_final = 0, 0.001
@@ -402,14 +438,20 @@ class TestBasicGradientSingleStep(TaylorTest):
         # step_dir[1::2] = -(y-y.min()) / (y.max()-y.min())
 
         # Increment `u` only along the pressure surface
-        surface_dofs = self.model.solid.vert_to_vdof.reshape(-1, 2)[self.model.fsi_verts]
-        xy_surface = self.model.solid.mesh.coordinates()[self.model.fsi_verts, :]
+        surface_dofs = self.surface_dofs
+        xy_surface = self.xy_surface
         x_surf, y_surf = xy_surface[:, 0], xy_surface[:, 1]
-        step_dir = dfn.Function(self.model.solid.vector_fspace).vector()
+        step_dir = self.step_dir
 
+        # Fill the step direction as a numpy array and set it in one call,
+        # rather than indexing the `dfn.Vector` repeatedly
         x_frac = (x_surf-x_surf.min())/(x_surf.max()-x_surf.min())
-        step_dir[np.array(surface_dofs[:, 0])] = 1*(1.0-x_frac) + 0.25*x_frac
-        step_dir[np.array(surface_dofs[:, 1])] = -1*(1.0-x_frac) + 0.25*x_frac
+        _step_dir = self.step_dir_local
+        _step_dir[:] = 0.0
+        _step_dir[surface_dofs[:, 0]] = 1*(1.0-x_frac) + 0.25*x_frac
+        _step_dir[surface_dofs[:, 1]] = -1*(1.0-x_frac) + 0.25*x_frac
+        step_dir.set_local(_step_dir)
+        step_dir.apply('insert')
         # step_dir[np.array(surface_dofs[:, 0])] = (y_surf/y_surf.max())**2
         # step_dir[np.array(surface_dofs[:, 1])] = (y_surf/y_surf.max())**2
 
@@ -433,16 +475,13 @@ class TestBasicGradientSingleStep(TaylorTest):
         save_path = f'out/linesearch_v0_{self.COUPLING}_{self.CASE_NAME}.h5'
         hs = 2.0**(np.arange(2, 9)-6)
 
-        xy = self.model.get_ref_config()[dfn.dof_to_vertex_map(self.model.solid.scalar_fspace)]
-        y = xy[:, 1]
-
         # Set the step direction as a linear (de)increase in x and y displacement in the y direction
         # step_dir = np.zeros(xy.size)
-        step_dir = dfn.Function(self.model.solid.vector_fspace).vector()
-        _step_dir = step_dir[:].copy()
-        _step_dir[:-1:2] = -(y-y.min()) / (y.max()-y.min())
-        _step_dir[1::2] = -(y-y.min()) / (y.max()-y.min())
-        step_dir[:] = _step_dir
+        step_dir = self.step_dir
+        _step_dir = self.step_dir_local
+        _step_dir.reshape(-1, 2)[:] = -self.y_frac[:, None]
+        step_dir.set_local(_step_dir)
+        step_dir.apply('insert')
 
         self.model.solid.forms['bc.dirichlet'].apply(step_dir)
         dstate = self.model.state0.copy()
@@ -458,15 +497,12 @@ class TestBasicGradientSingleStep(TaylorTest):
         save_path = f'out/linesearch_a0_{self.COUPLING}_{self.CASE_NAME}.h5'
         hs = 2.0**(np.arange(2, 9)+5)
 
-        xy = self.model.get_ref_config()[dfn.dof_to_vertex_map(self.model.solid.scalar_fspace)]
-        y = xy[:, 1]
-
         # Set the step direction as a linear (de)increase in x and y displacement in the y direction
-        step_dir = dfn.Function(self.model.solid.vector_fspace).vector()
-        _step_dir = step_dir[:].copy()
-        _step_dir[:-1:2] = -(y-y.min()) / (y.max()-y.min())
-        _step_dir[1::2] = -(y-y.min()) / (y.max()-y.min())
-        step_dir[:] = _step_dir
+        step_dir = self.step_dir
+        _step_dir = self.step_dir_local
+        _step_dir.reshape(-1, 2)[:] = -self.y_frac[:, None]
+        step_dir.set_local(_step_dir)
+        step_dir.apply('insert')
 
         self.model.solid.forms['bc.dirichlet'].apply(step_dir)
         dstate = self.model.state0.copy()
@@ -503,6 +539,7 @@ class TestBasicGradientSingleStep(TaylorTest):
 if __name__ == '__main__':
     # unittest.main()
 
+    TestBasicGradient.setUpClass()
     test = TestBasicGradient()
     test.setUp()
     test.test_emod()
@@ -512,6 +549,7 @@ if __name__ == '__main__':
     test.test_a0()
     # test.test_times()
 
+    # TestBasicGradientSingleStep.setUpClass()
     # test = TestBasicGradientSingleStep()
     # test.setUp()
     # test.test_emod()
@@ -23,13 +23,14 @@ from petsc4py import PETSc
 # warnings.filterwarnings('error', 'RuntimeWarning')
 # np.seterr(invalid='raise')
 
-def _set_dirichlet_bvec(dirichlet_bc, bvec: bv.BlockVector):
+def _set_dirichlet_bvec(dirichlet_bcs, bvec: bv.BlockVector):
     for label in ['u', 'v']:
         if label in bvec:
             subvec = bvec.sub[label]
             if isinstance(subvec, PETSc.Vec):
                 subvec = dfn.PETScVector(subvec)
-            dirichlet_bc.apply(subvec)
+            for dirichlet_bc in dirichlet_bcs:
+                dirichlet_bc.apply(subvec)
     return bvec
 
 @pytest.fixture(
@@ -229,8 +230,7 @@ def dstate(model):
         # model_solid.forms['bc.dirichlet'].apply(dxv)
         dstate['v'] = dxv
 
-        for bc in model_solid.residual.dirichlet_bcs:
-            _set_dirichlet_bvec(bc, dstate)
+        _set_dirichlet_bvec(model_solid.residual.dirichlet_bcs, dstate)
 
     if model_fluids is not None:
         values = {
@@ -255,8 +255,7 @@ def dstatet(model):
 
     dstatet[:] = 1e-6
     if model_solid is not None:
-        for bc in model_solid.residual.dirichlet_bcs:
-            _set_dirichlet_bvec(bc, dstatet)
+        _set_dirichlet_bvec(model_solid.residual.dirichlet_bcs, dstatet)
 
     return dstatet
 
@@ -285,10 +284,9 @@ def dprop(model):
             # Use a uniaxial y stretching motion
             fspace = model_solid.residual.form['coeff.state.u1'].function_space()
             VDOF_TO_VERT = dfn.dof_to_vertex_map(fspace)
-            coords = np.array(model_solid.XREF[:]).copy().reshape(-1, 2)
-            umesh = coords.copy()
-            umesh[:, 0] = 0
-            umesh[:, 1] = 1e-5*coords[:, 1]/coords[:, 1].max()
+            y = model_solid.XREF[1::2]
+            umesh = np.zeros((y.size, 2))
+            umesh[:, 1] = 1e-5*y/y.max()
             dprop['umesh'] = umesh.reshape(-1)[VDOF_TO_VERT]
             # dprop['umesh'] = 0
     return dprop
@@ -313,6 +311,19 @@ def set_and_assemble(x, set_x, assem):
     # tensor
     return assem().copy()
 
+def _print_sub_norms(vecs, names):
+    """
+    Print the norm of each sub-vector of a set of block vectors
+
+    Norms of all vectors are printed as one table, with a row for each
+    sub-vector, instead of printing each norm separately.
+    """
+    keys = vecs[0].labels[0]
+    norms = np.array([[subvec.norm() for subvec in vec.sub_blocks] for vec in vecs])
+    print("\n", names)
+    for key, row in zip(keys, norms.T):
+        print(key, row)
+
 def _test_taylor(x0, dx, res, jac):
     """
     Test that the Taylor convergence order is 2
@@ -324,78 +335,41 @@ def _test_taylor(x0, dx, res, jac):
     dres_exacts = [res_n-res_0 for res_n in res_ns]
     dres_linear = bla.mult_mat_vec(jac(x0), dx)
 
-    errs = [
-        (dres_exact-float(alpha)*dres_linear).norm()
-        for dres_exact, alpha in zip(dres_exacts, alphas)
-    ]
-    magnitudes = [
-        1/2*(dres_exact+float(alpha)*dres_linear).norm()
-        for dres_exact, alpha in zip(dres_exacts, alphas)
-    ]
+    errs = np.zeros(alphas.size)
+    magnitudes = np.zeros(alphas.size)
+    for n, (dres_exact, alpha) in enumerate(zip(dres_exacts, alphas)):
+        dres_step = float(alpha)*dres_linear
+        errs[n] = (dres_exact-dres_step).norm()
+        magnitudes[n] = 1/2*(dres_exact+dres_step).norm()
     with np.errstate(invalid='ignore'):
-        conv_rates = [
-            np.log(err_0/err_1)/np.log(alpha_0/alpha_1)
-            for err_0, err_1, alpha_0, alpha_1
-            in zip(errs[:-1], errs[1:], alphas[:-1], alphas[1:])]
-        rel_errs = np.array(errs)/np.array(magnitudes)*100
+        conv_rates = np.log(errs[:-1]/errs[1:]) / np.log(alphas[:-1]/alphas[1:])
+        rel_errs = errs/magnitudes*100
 
     print("")
     print(f"||dres_linear||, ||dres_exact|| = {dres_linear.norm()}, {dres_exacts[-1].norm()}")
     print("Relative errors: ", rel_errs)
-    print("Convergence rates: ", np.array(conv_rates))
-
-
-def test_assem_dres_dstate(
-        model, state, statet, control, prop,
-        dstate
-    ):
-    """
-    Test `model.assem_dres_dstate`
-    """
-    set_linearization(model, state, statet, control, prop)
-    res = lambda state: set_and_assemble(state, model.set_state, model.assem_res)
-    jac = lambda state: set_and_assemble(state, model.set_state, model.assem_dres_dstate)
-
-    _test_taylor(state, dstate, res, jac)
+    print("Convergence rates: ", conv_rates)
 
-def test_assem_dres_dstatet(
-        model, state, statet, control, prop,
-        dstatet
-    ):
-    """
-    Test `model.assem_dres_dstatet`
-    """
-    set_linearization(model, state, statet, control, prop)
-    res = lambda state: set_and_assemble(state, model.set_statet, model.assem_res)
-    jac = lambda state: set_and_assemble(state, model.set_statet, model.assem_dres_dstatet)
 
-    _test_taylor(statet, dstatet, res, jac)
-
-def test_assem_dres_dcontrol(
+@pytest.mark.parametrize('name', ['state', 'statet', 'control', 'prop'])
+def test_assem_dres(
         model, state, statet, control, prop,
-        dcontrol
+        name, request
     ):
     """
-    Test `model.assem_dres_dcontrol`
-    """
-    set_linearization(model, state, statet, control, prop)
-    res = lambda state: set_and_assemble(state, model.set_control, model.assem_res)
-    jac = lambda state: set_and_assemble(state, model.set_control, model.assem_dres_dcontrol)
-
-    _test_taylor(control, dcontrol, res, jac)
+    Test `model.assem_dres_dstate`, `model.assem_dres_dstatet`, etc.
 
-def test_assem_dres_dprops(
-        model, state, statet, control, prop,
-        dprop
-    ):
-    """
-    Test `model.assem_dres_dprops`
+    `name` is the model input the residual is differentiated with respect to.
     """
     set_linearization(model, state, statet, control, prop)
-    res = lambda state: set_and_assemble(state, model.set_prop, model.assem_res)
-    jac = lambda state: set_and_assemble(state, model.set_prop, model.assem_dres_dprop)
+    set_x = getattr(model, f'set_{name}')
+    assem_dres_dx = getattr(model, f'assem_dres_d{name}')
+    res = lambda x: set_and_assemble(x, set_x, model.assem_res)
+    jac = lambda x: set_and_assemble(x, set_x, assem_dres_dx)
 
-    _test_taylor(prop, dprop, res, jac)
+    x0 = {'state': state, 'statet': statet, 'control': control, 'prop': prop}[name]
+    dx = request.getfixturevalue(f'd{name}')
+    _test_taylor(x0, dx, res, jac)
 
 def test_dres_dstate_vs_dres_state(
         model, model_linear, state, statet, control, prop,
@@ -426,10 +400,10 @@ def test_dres_dstate_vs_dres_state(
     dres_state_b = set_and_assemble(state, model_linear.set_state, model_linear.assem_res)
     err = dres_state_a - dres_state_b
 
-    for vec, name in zip([dres_state_a, dres_state_b, err], ["from model", "from linear_state_model", "error"]):
-        print(f"\n{name}")
-        for key, subvec in vec.sub_items():
-            print(key, subvec.norm())
+    _print_sub_norms(
+        [dres_state_a, dres_state_b, err],
+        ["from model", "from linear_state_model", "error"]
+    )
 
 def test_dres_dstatet_vs_dres_statet(
         model, model_linear, state, statet, control, prop,
@@ -460,7 +434,7 @@ def test_dres_dstatet_vs_dres_statet(
     dres_statet_b = set_and_assemble(statet, model_linear.set_state, model_linear.assem_res)
     err = dres_statet_a - dres_statet_b
 
-    for vec, name in zip([dres_statet_a, dres_statet_b, err], ["from model", "from linear_state_model", "error"]):
-        print(f"\n{name}")
-        for key, subvec in vec.sub_items():
-            print(key, subvec.norm())
+    _print_sub_norms(
+        [dres_statet_a, dres_statet_b, err],
+        ["from model", "from linear_state_model", "error"]
+    )
@@ -8,7 +8,6 @@ from time import perf_counter
 import warnings
 
 import numpy as np
-import matplotlib.pyplot as plt
 import dolfin as dfn
 import pandas as pd
 
@@ -91,17 +90,12 @@ class TestIntegrate:
     @pytest.fixture()
     def ini_state(self, model):
         """Return the initial state"""
-        xy = model.solid.XREF[:].copy().reshape(-1, 2)
-        x = xy[:, 0]
-        y = xy[:, 1]
-        u0 = dfn.Function(model.solid.residual.form['coeff.state.u0'].function_space()).vector()
-
         # model.fluid.set_prop(fluid_props)
         # qp0, *_ = model.fluids[0].solve_qp0()
 
+        # The initial state is at rest in the reference configuration
         ini_state = model.state0.copy()
         ini_state[:] = 0.0
-        ini_state['u'][:] = u0
         # ini_state['q'][()] = qp0['q']
         # ini_state['p'][:] = qp0['p']
         return ini_state
@@ -229,7 +223,11 @@ class TestIntegrate:
             t = f.get_times()
             gw = TimeSeries(solidfunc.MeanGlottalWidth(model))(f)
 
-        fig, ax = plt.subplots(1, 1)
+        # A `Figure` is created directly since it's only saved to file; this
+        # avoids importing `pyplot` and selecting a GUI backend
+        from matplotlib.figure import Figure
+        fig = Figure()
+        ax = fig.subplots(1, 1)
         ax.plot(t, gw)
         ax.set_xlabel("Time [s]")
         ax.set_ylabel("Glottal width [cm]")
@@ -1,5 +1,114 @@
+"""
+Test `femvf.statefile`
+"""
 
-## Tests of writing properties
+import pytest
 
-# def test_get_solid_props(0):
-#     pass
\ No newline at end of file
+import numpy as np
+import h5py
+
+from femvf import statefile as sf
+from femvf.load import load_transient_fsi_model
+from femvf.models.transient import (solid as tsmd, fluid as tfmd)
+
+NCHUNK = 4
+
+@pytest.fixture
+def model():
+    """
+    Return a model (subclass of `BaseTransientModel`)
+    """
+    return load_transient_fsi_model(
+        '../meshes/M5_BC--GA0.00--DZ0.00.msh', None,
+        SolidType=tsmd.KelvinVoigt,
+        FluidType=tfmd.BernoulliAreaRatioSep
+    )
+
+@pytest.fixture(
+    params=[
+        NCHUNK-1,
+        NCHUNK,
+        3*NCHUNK+1
+    ]
+)
+def num_steps(request):
+    """
+    Return the number of appended time steps
+
+    These cover a single partial chunk, exactly one chunk and a partial last
+    chunk.
+    """
+    return request.param
+
+def append_steps(f: sf.StateFile, model, num_steps: int):
+    """
+    Append `num_steps` time steps with values equal to the step index
+    """
+    state = model.state0.copy()
+    control = model.control.copy()
+    for n in range(num_steps):
+        state[:] = n
+        control[:] = n
+        f.append_state(state)
+        f.append_control(control)
+        f.append_time(0.1*n)
+
+def assert_steps_equal(f: sf.StateFile, num_steps: int):
+    """
+    Assert the statefile contains the time steps from `append_steps`
+    """
+    assert f.size == num_steps
+    assert np.all(f.get_times() == 0.1*np.arange(num_steps))
+    for n in range(num_steps):
+        for vec in f.get_state(n).blocks:
+            assert np.all(vec[:] == n)
+        for vec in f.get_control(n).blocks:
+            assert np.all(vec[:] == n)
+
+def test_append_round_trip(model, num_steps, tmp_path):
+    """
+    Test appended time steps can be read back before and after closing the file
+    """
+    fpath = str(tmp_path / 'test.h5')
+    with sf.StateFile(model, fpath, mode='w', NCHUNK=NCHUNK) as f:
+        append_steps(f, model, num_steps)
+        assert_steps_equal(f, num_steps)
+
+    with sf.StateFile(model, fpath, mode='r') as f:
+        assert_steps_equal(f, num_steps)
+
+def test_append_round_trip_group(model, num_steps, tmp_path):
+    """
+    Test closing a statefile in an `h5py.Group` writes buffered time steps
+
+    Closing the statefile leaves the group's file open so the buffered time
+    steps have to be written before then.
+    """
+    fpath = str(tmp_path / 'test.h5')
+    with h5py.File(fpath, mode='w') as file:
+        f = sf.StateFile(model, file.require_group('run'), mode='a', NCHUNK=NCHUNK)
+        append_steps(f, model, num_steps)
+        f.close()
+
+        assert file['run/time'].shape[0] == num_steps
+        assert file['run/state/u'].shape[0] == num_steps
+
+    with h5py.File(fpath, mode='r') as file:
+        f = sf.StateFile(model, file['run'], mode='r')
+        assert_steps_equal(f, num_steps)
+        f.close()
+
+def test_item_access_after_append(model, tmp_path):
+    """
+    Test item access writes after the buffered time steps
+    """
+    fpath = str(tmp_path / 'test.h5')
+    with sf.StateFile(model, fpath, mode='w', NCHUNK=NCHUNK) as f:
+        append_steps(f, model, NCHUNK+1)
+        f['time'][-1] = -1.0
+        f['extra'] = np.ones(2)
+
+    with sf.StateFile(model, fpath, mode='r') as f:
+        assert f.size == NCHUNK+1
+        assert f.get_time(-1) == -1.0
+        assert np.all(f['extra'][:] == 1.0)
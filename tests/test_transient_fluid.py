@@ -51,6 +51,35 @@ def test_pressure_qualitative(model):
     # print(model.assem_dres_dcontrol().bshape)
     # print(model.assem_dres_dprops().bshape)
 
+def test_setters_update_primals():
+    """
+    Test that the input setters update the model inputs and `primals`
+
+    `primals` references the model inputs, so it must see values assigned by
+    the setters without being rebuilt.
+    """
+    model = setup_model()
+
+    state0 = model.state0.copy()
+    state0[:] = 1.0
+    state1 = model.state1.copy()
+    state1[:] = 2.0
+    control = model.control.copy()
+    control[:] = 3.0
+
+    model.set_ini_state(state0)
+    model.set_fin_state(state1)
+    model.set_control(control)
+
+    for bvec, value in zip(
+            (model.state0, model.state1, model.control), (1.0, 2.0, 3.0)
+        ):
+        assert all(np.all(subvec == value) for subvec in bvec.blocks)
+
+    primal_state1, primal_control, _ = model.primals
+    assert all(np.all(subvec == 2.0) for subvec in primal_state1.values())
+    assert all(np.all(subvec == 3.0) for subvec in primal_control.values())
+
 if __name__ == '__main__':
     model = setup_model()
 
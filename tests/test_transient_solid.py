@@ -0,0 +1,120 @@
+"""
+Various tests of the transient solid models
+"""
+
+from os import path
+
+import pytest
+import numpy as np
+import dolfin as dfn
+
+from blockarray import blockvec as bv
+from blockarray.blockmat import BlockMatrix
+
+from femvf.models.transient import solid as tsmd
+from femvf.load import load_solid_model
+from femvf.solverconst import DEFAULT_NEWTON_SOLVER_PRM
+from femvf.constants import PASCAL_TO_CGS
+
+@pytest.fixture(
+    params=[
+        'M5_BC--GA0.00--DZ0.00.msh'
+    ]
+)
+def mesh_path(request):
+    mesh_name = request.param
+    return path.join('../meshes', mesh_name)
+
+@pytest.fixture(
+    params=[
+        tsmd.KelvinVoigt
+    ]
+)
+def model(mesh_path, request):
+    """
+    Return a transient solid model with set properties, control and initial state
+    """
+    model = load_solid_model(mesh_path, request.param)
+
+    prop = model.prop.copy()
+    default_prop = {
+        'emod': 5e3*PASCAL_TO_CGS,
+        'rho': 1.0,
+        'nu': 0.45,
+        'eta': 5.0
+    }
+    for key, value in default_prop.items():
+        if key in prop:
+            prop[key] = value
+    model.set_prop(prop)
+
+    control = model.control.copy()
+    control['p'][:] = 500*PASCAL_TO_CGS
+    model.set_control(control)
+
+    ini_state = model.state0.copy()
+    ini_state[:] = 0.0
+    model.set_ini_state(ini_state)
+    model.dt = 5e-5
+    return model
+
+def transpose(mat):
+    """
+    Return the transpose of a `dfn.PETScMatrix`
+    """
+    return dfn.PETScMatrix(dfn.as_backend_type(mat).mat().copy().transpose())
+
+def test_solve_state1_reuse_jacobian(model):
+    """
+    Test the modified Newton method converges to the same state as Newton's method
+    """
+    state1_guess = model.state0.copy()
+
+    options = DEFAULT_NEWTON_SOLVER_PRM.copy()
+    state1_ref, _ = model.solve_state1(state1_guess, options)
+    state1_reuse, info = model.solve_state1(
+        state1_guess, {**options, 'reuse_jacobian': True}
+    )
+
+    assert (
+        info['abs_err'] <= options['absolute_tolerance']
+        or info['rel_err'] <= options['relative_tolerance']
+    )
+    err = bv.norm(state1_reuse - state1_ref)
+    assert err <= 1e-6 * bv.norm(state1_ref)
+
+def test_solve_dres_dstate1_adj_after_forward_solve(model):
+    """
+    Test the adjoint solve is correct after a forward solve with the shared LU solver
+    """
+    # A forward solve leaves the LU solver factored with the forward Jacobian
+    state1, _ = model.solve_state1(model.state0.copy())
+    model.set_fin_state(state1)
+
+    jac = model.assem_dres_dstate1()
+    labels = jac.labels[0]
+    # The adjoint solve indexes the transposed blocks under the forward
+    # block labels, i.e. `jac_adj.sub[i, j]` is `jac.sub[i, j]^T`
+    submats = [
+        transpose(jac.sub[row, col]) for row in labels for col in labels
+    ]
+    jac_adj = BlockMatrix(
+        submats, shape=(3, 3), labels=jac.labels, check_bshape=False
+    )
+
+    b = model.state1.copy()
+    for label in labels:
+        b[label][:] = np.random.rand(b[label].size())
+
+    x = model.solve_dres_dstate1_adj(jac_adj, model.state1.copy(), b)
+
+    # Check `jac^T x = b`
+    res_u = (
+        jac_adj.sub['u', 'u']*x['u']
+        + jac_adj.sub['v', 'u']*x['v']
+        + jac_adj.sub['a', 'u']*x['a']
+        - b['u']
+    )
+    assert res_u.norm('l2') <= 1e-8 * b['u'].norm('l2')
+    assert np.allclose(x['v'][:], b['v'][:])
+    assert np.allclose(x['a'][:], b['a'][:])
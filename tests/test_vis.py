@@ -0,0 +1,69 @@
+"""
+Test `femvf.vis.vis`
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import dolfin as dfn
+
+from femvf.vis import vis
+
+class SmallModel:
+    """
+    A small model with the attributes used for plotting
+    """
+
+    def __init__(self):
+        self.mesh = dfn.UnitSquareMesh(4, 4)
+        vector_fspace = dfn.VectorFunctionSpace(self.mesh, 'CG', 1)
+        scalar_fspace = dfn.FunctionSpace(self.mesh, 'CG', 1)
+
+        is_surface = self.mesh.coordinates()[:, 1] == 1.0
+        self.fsi_verts = np.arange(self.mesh.num_vertices())[is_surface]
+        self.vert_to_sdof = dfn.vertex_to_dof_map(scalar_fspace)
+        self.ycontact = dfn.Constant(0.9)
+        self.solid = SimpleNamespace(
+            vector_fspace=vector_fspace,
+            vert_to_vdof=dfn.vertex_to_dof_map(vector_fspace)
+        )
+
+@pytest.fixture
+def model():
+    return SmallModel()
+
+def test_update_figure(model):
+    """
+    Test `update_figure` runs on a figure from `init_figure`
+    """
+    fluid_props = {'y_midline': 1.1, 'p_sub': 800.0*10}
+    fig, axs, artists, indices = vis.init_figure(model, fluid_props)
+
+    u = dfn.Function(model.solid.vector_fspace)
+    x = (u, u.copy(deepcopy=True), u.copy(deepcopy=True))
+    num_surface = model.fsi_verts.shape[0]
+    fluid_info = {
+        'xy_min': [0.5, 1.0],
+        'xy_sep': [0.75, 1.0],
+        'pressure': np.linspace(800.0*10, 0, num_surface)
+    }
+    solid_props = {
+        'elastic_modulus': 5e4*np.ones(model.vert_to_sdof.shape[0])
+    }
+
+    for n, t in enumerate([0.0, 1e-3]):
+        u.vector()[:] = 0.01*n
+        vis.update_figure(
+            fig, axs, artists, indices,
+            model, t, x, fluid_info, solid_props, fluid_props
+        )
+
+    xy_surface = model.mesh.coordinates()[model.fsi_verts] + 0.01
+    assert np.allclose(artists['surface'].get_xydata(), xy_surface)
+    assert artists['glottal_width'].get_xdata().shape == (3,)
+    plt.close(fig)
@@ -17,7 +17,10 @@ from femvf.models.transient.solid import Rayleigh
 from femvf.models.transient.fluid import BernoulliAreaRatioSep
 from femvf.forward import integrate
 
-from femvf.vis.xdmfutils import export_mesh_values, write_xdmf, XDMFArray, make_format_dataset
+from femvf.vis.xdmfutils import (
+    export_mesh_values, write_xdmf, XDMFArray, make_format_dataset,
+    open_export_file, export_dataset
+)
 from femvf.postprocess.base import TimeSeries
 from femvf.postprocess import solid as slpost
 
@@ -94,7 +97,7 @@ def test_write_xdmf(model, state_fpath):
     xdmf_path = f'{path.splitext(state_fpath)[0]}--export.xdmf'
 
     with (
-            h5py.File(state_fpath, mode='r') as state_file,
+            h5py.File(state_fpath, mode='r', **sf.DEFAULT_CHUNK_CACHE) as state_file,
             h5py.File(post_path, mode='r') as post_file
         ):
         datasets = [
@@ -118,7 +121,7 @@ def test_write_xdmf(model, state_fpath):
         formats += len(scalar_labels)*[fspace_cg1_scalar]
         labels += scalar_labels
 
-        with h5py.File(xdmf_data_path, mode='w') as f:
+        with open_export_file(xdmf_data_path, mode='w') as f:
             export_mesh_values(datasets, formats, f)
 
     with h5py.File(xdmf_data_path, mode='r') as f:
@@ -149,6 +152,31 @@ def test_write_xdmf(model, state_fpath):
             xdmf_path
         )
 
+@pytest.fixture(params=[None, 'gzip'])
+def compression(request):
+    return request.param
+
+def test_export_dataset_unaligned_blocks(compression, tmp_path):
+    """
+    Test exporting a dataset in blocks that aren't aligned with its chunks
+
+    Blocks start and end partway through chunks and the last chunk is only
+    partially filled. Unfiltered datasets write whole chunks directly while
+    compressed datasets only use slice assignment.
+    """
+    values = np.random.rand(103, 7)
+    with h5py.File(tmp_path / 'test.h5', mode='w') as f:
+        input_dataset = f.create_dataset('input', data=values, chunks=(10, 7))
+        dataset = export_dataset(
+            input_dataset, f, 'output',
+            block_size=25, chunks=(10, 7), compression=compression
+        )
+
+        num_filters = dataset.id.get_create_plist().get_nfilters()
+        assert (num_filters == 0) == (compression is None)
+        assert dataset.chunks == (10, 7)
+        assert np.array_equal(dataset[()], values)
+
 
 class TestXDMFArray:
 
@@ -162,3 +190,8 @@ class TestXDMFArray:
 
     def test_to_xdmf_slice(self, xdmf_array):
         print(xdmf_array.to_hyperslab((0,)))
+
+    def test_slice_shape(self, xdmf_array):
+        assert xdmf_array.slice_shape((0,)) == (100,)
+        assert xdmf_array.slice_shape((slice(None), 5)) == (5,)
+        assert xdmf_array.slice_shape((..., slice(0, 10, 2))) == (5, 5)